@@ -0,0 +1,179 @@
+"""Moves old closed proposals to ``proposals_archive`` and keeps ``proposal_rollups`` in step.
+
+Run by the in-process scheduler or with ``python -m app.archive [--days 365]``.
+"""
+
+import argparse
+import logging
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_archive_after_days, get_archive_interval_hours
+from .database import shard_engines, shard_session
+
+logger = logging.getLogger("freelatracker.archive")
+
+ARCHIVE_BATCH_SIZE = 1000
+CLOSED_STATUS_CODES = (
+    models.PROPOSAL_STATUS_CODES["Aceptada"],
+    models.PROPOSAL_STATUS_CODES["Rechazada"],
+)
+# Every hot column has a twin in the archive; ``archived_at`` is added on copy.
+_COPIED_COLUMNS = [column.name for column in models.Proposal.__table__.columns]
+
+
+def _archive_batch(db: Session, cutoff: datetime, now: datetime, batch_size: int) -> int:
+    hot = models.Proposal.__table__
+    ids = list(
+        db.execute(
+            select(hot.c.id)
+            .where(hot.c.status_code.in_(CLOSED_STATUS_CODES), hot.c.created_at < cutoff)
+            .order_by(hot.c.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars()
+    )
+    if not ids:
+        return 0
+    chosen = hot.c.id.in_(ids)
+
+    db.execute(
+        insert(models.ArchivedProposal.__table__).from_select(
+            [*_COPIED_COLUMNS, "archived_at"],
+            select(*(hot.c[name] for name in _COPIED_COLUMNS), literal(now, DateTime(timezone=True))).where(chosen),
+        )
+    )
+
+    totals = db.execute(
+        select(
+            hot.c.owner_id,
+            hot.c.status_code,
+            hot.c.currency_id,
+            func.count(),
+            func.coalesce(func.sum(hot.c.amount), 0.0),
+        )
+        .where(chosen)
+        .group_by(hot.c.owner_id, hot.c.status_code, hot.c.currency_id)
+    ).all()
+    for owner_id, status_code, currency_id, count, amount in totals:
+        rollup = db.get(models.ProposalRollup, (owner_id, status_code, currency_id))
+        if rollup is None:
+            rollup = models.ProposalRollup(
+                owner_id=owner_id,
+                status_code=status_code,
+                currency_id=currency_id,
+                proposal_count=0,
+                amount_total=0.0,
+            )
+            db.add(rollup)
+        rollup.proposal_count += count
+        rollup.amount_total += float(amount)
+
+    db.execute(delete(hot).where(chosen))
+    db.commit()
+    return len(ids)
+
+
+def archive_closed_proposals(
+    db: Session,
+    older_than_days: int,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    now: Optional[datetime] = None,
+) -> int:
+    """Move closed proposals older than ``older_than_days``; returns how many moved."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=older_than_days)
+    moved = 0
+    while True:
+        try:
+            count = _archive_batch(db, cutoff, now, batch_size)
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        moved += count
+        if count < batch_size:
+            return moved
+
+
+def run_archival(older_than_days: Optional[int] = None) -> int:
+    days = older_than_days or get_archive_after_days()
+    moved = 0
+    for shard in shard_engines():
+        db = shard_session(shard)
+        try:
+            moved += archive_closed_proposals(db, days)
+        finally:
+            db.close()
+    if moved:
+        logger.info("Archived %d closed proposals older than %d days", moved, days)
+    return moved
+
+
+class ArchiveScheduler:
+    """Runs ``run_archival`` every ``interval_hours`` until stopped."""
+
+    def __init__(self, interval_hours: float):
+        self._interval = interval_hours * 3600
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="proposal-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                run_archival()
+            except Exception:
+                logger.exception("Archival run failed; retrying at the next interval")
+
+
+_scheduler: Optional[ArchiveScheduler] = None
+
+
+def start_archive_scheduler() -> None:
+    global _scheduler
+    interval = get_archive_interval_hours()
+    if interval <= 0 or _scheduler is not None:
+        return
+    _scheduler = ArchiveScheduler(interval)
+    _scheduler.start()
+
+
+def stop_archive_scheduler() -> None:
+    global _scheduler
+    if _scheduler is None:
+        return
+    _scheduler.stop()
+    _scheduler = None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mueve las propuestas cerradas antiguas al archivo.")
+    parser.add_argument("--days", type=int, default=None, help="Antigüedad mínima en días.")
+    args = parser.parse_args(argv)
+    moved = run_archival(args.days)
+    print(f"Propuestas archivadas: {moved}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    sys.exit(main())
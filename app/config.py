@@ -15,6 +15,7 @@ ENV_NAME_ENV_VAR = "FREELATRACKER_ENV"
 DEV_ENV_VALUES = {"dev", "development", "local"}
 PROD_ENV_VALUES = {"prod", "production", "staging"}
 ENV_FILE_PATH = Path(__file__).resolve().parent.parent / ".env"
+DEFAULT_FX_RATES_FILE = Path(__file__).resolve().parent / "data" / "fx_rates.csv"
 
 
 def _current_env() -> str:
@@ -100,3 +101,130 @@ def should_auto_create_tables() -> bool:
     default_raw = "false" if _current_env() in PROD_ENV_VALUES else "true"
     raw = os.getenv(AUTO_CREATE_TABLES_ENV, default_raw).lower()
     return raw in ("1", "true", "yes", "on")
+
+
+@lru_cache()
+def get_base_currency() -> str:
+    raw = os.getenv("FREELATRACKER_BASE_CURRENCY", "USD").strip().upper()
+    return raw or "USD"
+
+
+@lru_cache()
+def get_fx_rates_file() -> Path:
+    raw = os.getenv("FREELATRACKER_FX_RATES_FILE", "").strip()
+    return Path(raw) if raw else DEFAULT_FX_RATES_FILE
+
+
+@lru_cache()
+def get_sqlite_shard_count() -> int:
+    """Number of SQLite shard files; 0 or 1 keeps the single-database layout."""
+    raw = os.getenv("FREELATRACKER_SQLITE_SHARDS", "0")
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    return max(value, 0)
+
+
+@lru_cache()
+def should_coalesce_writes() -> bool:
+    raw = os.getenv("FREELATRACKER_WRITE_COALESCING", "false").lower()
+    return raw in ("1", "true", "yes", "on")
+
+
+@lru_cache()
+def get_write_batch_size() -> int:
+    raw = os.getenv("FREELATRACKER_WRITE_BATCH_SIZE", "64")
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 64
+    return max(value, 1)
+
+
+@lru_cache()
+def get_write_batch_max_delay_ms() -> float:
+    raw = os.getenv("FREELATRACKER_WRITE_BATCH_MS", "5")
+    try:
+        value = float(raw)
+    except ValueError:
+        value = 5.0
+    return max(value, 0.0)
+
+
+@lru_cache()
+def get_log_mode() -> str:
+    """``plain`` (stream via basicConfig) or ``async`` (queue + JSON lines)."""
+    raw = os.getenv("FREELATRACKER_LOG_MODE", "plain").strip().lower()
+    return raw if raw in ("plain", "async") else "plain"
+
+
+@lru_cache()
+def get_log_event_burst() -> int:
+    raw = os.getenv("FREELATRACKER_LOG_EVENT_BURST", "20")
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 20
+    return max(value, 0)
+
+
+@lru_cache()
+def get_profiling_token() -> str:
+    return os.getenv("FREELATRACKER_PROFILING_TOKEN", "").strip()
+
+
+@lru_cache()
+def is_profiling_enabled() -> bool:
+    """Profiling needs both the flag and an admin token to be configured."""
+    raw = os.getenv("FREELATRACKER_PROFILING_ENABLED", "false").lower()
+    return raw in ("1", "true", "yes", "on") and bool(get_profiling_token())
+
+
+@lru_cache()
+def get_profile_dir() -> Path:
+    raw = os.getenv("FREELATRACKER_PROFILE_DIR", "").strip()
+    return Path(raw) if raw else Path("profiles")
+
+
+@lru_cache()
+def get_idempotency_ttl_hours() -> float:
+    raw = os.getenv("FREELATRACKER_IDEMPOTENCY_TTL_HOURS", "24")
+    try:
+        value = float(raw)
+    except ValueError:
+        value = 24.0
+    return max(value, 0.0)
+
+
+@lru_cache()
+def get_idempotency_cache_size() -> int:
+    """Entries kept in the per-worker LRU in front of ``idempotency_keys``."""
+    raw = os.getenv("FREELATRACKER_IDEMPOTENCY_CACHE_SIZE", "10000")
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 10000
+    return max(value, 0)
+
+
+@lru_cache()
+def get_archive_after_days() -> int:
+    """Closed proposals created longer ago than this move to the archive."""
+    raw = os.getenv("FREELATRACKER_ARCHIVE_AFTER_DAYS", "365")
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 365
+    return max(value, 1)
+
+
+@lru_cache()
+def get_archive_interval_hours() -> float:
+    """How often each worker runs the archival job; 0 disables it."""
+    raw = os.getenv("FREELATRACKER_ARCHIVE_INTERVAL_HOURS", "24")
+    try:
+        value = float(raw)
+    except ValueError:
+        value = 24.0
+    return max(value, 0.0)
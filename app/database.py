@@ -1,28 +1,124 @@
-from typing import Generator
+import zlib
+from pathlib import Path
+from typing import Dict, Generator, List, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
-from .config import get_database_url, should_auto_create_tables
+from .config import get_database_url, get_sqlite_shard_count, should_auto_create_tables
 
 
-def _build_engine():
-    url = get_database_url()
+def _build_engine(url: Optional[str] = None):
+    url = url or get_database_url()
     connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
     return create_engine(url, connect_args=connect_args)
 
 
+def shard_urls(url: str, count: int) -> List[str]:
+    """SQLite URLs of the shard files that live next to the directory database."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or not parsed.database or parsed.database == ":memory:":
+        raise RuntimeError("El modo con shards requiere una base SQLite en archivo.")
+    path = Path(parsed.database)
+    return [
+        parsed.set(database=str(path.with_name(f"{path.stem}.shard{idx}{path.suffix}"))).render_as_string(
+            hide_password=False
+        )
+        for idx in range(count)
+    ]
+
+
+def _enable_wal(engine: Engine) -> None:
+    # WAL lets readers proceed while the shard's single writer commits.
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
+class ShardedSession(Session):
+    """Session that routes every statement to the owner's SQLite shard.
+
+    Tables of ``DirectoryBase`` always go to the directory engine. Everything
+    else goes to the shard stored in ``session.info["shard"]``, which
+    ``route_to_owner`` sets as soon as the user is known.
+    """
+
+    directory_engine: Engine
+    shard_engines: List[Engine]
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if mapper is not None and mapper.persist_selectable.metadata is DirectoryBase.metadata:
+            return self.directory_engine
+        shard = self.info.get("shard")
+        if shard is None:
+            raise RuntimeError("La sesion no tiene un shard asignado.")
+        return self.shard_engines[shard]
+
+
+def build_sharded_sessionmaker(directory_engine: Engine, urls: List[str]) -> sessionmaker:
+    engines = [_build_engine(url) for url in urls]
+    for shard_engine in engines:
+        _enable_wal(shard_engine)
+    session_class = type(
+        "BoundShardedSession",
+        (ShardedSession,),
+        {"directory_engine": directory_engine, "shard_engines": engines},
+    )
+    return sessionmaker(
+        class_=session_class,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
 engine = _build_engine()
+SHARD_COUNT = get_sqlite_shard_count()
 
-# Avoid expiring objects after each commit to prevent redundant SELECTs when returning models.
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    expire_on_commit=False,
-    bind=engine,
-)
+if SHARD_COUNT > 1:
+    # The configured database becomes the global email -> user/shard directory.
+    SessionLocal = build_sharded_sessionmaker(engine, shard_urls(get_database_url(), SHARD_COUNT))
+else:
+    # Avoid expiring objects after each commit to prevent redundant SELECTs when returning models.
+    SessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=engine,
+    )
 
 Base = declarative_base()
+# Tables that live only in the directory database when sharding is enabled.
+DirectoryBase = declarative_base()
+
+
+def is_sharded() -> bool:
+    return SHARD_COUNT > 1
+
+
+def shard_for_owner(owner_id: int, count: int) -> int:
+    return zlib.crc32(str(owner_id).encode("ascii")) % count
+
+
+def route_to_owner(db: Session, owner_id: int) -> None:
+    """Point ``db`` at the shard holding ``owner_id`` (no-op when not sharded)."""
+    if isinstance(db, ShardedSession):
+        db.info["shard"] = shard_for_owner(owner_id, len(db.shard_engines))
+
+
+def shard_engines() -> Dict[Optional[int], Engine]:
+    """Engines holding proposal data, keyed by shard (``None`` when not sharded)."""
+    if not is_sharded():
+        return {None: engine}
+    return dict(enumerate(SessionLocal.class_.shard_engines))
+
+
+def shard_session(shard: Optional[int]) -> Session:
+    return SessionLocal(info={"shard": shard})
 
 
 # Dependencia de FastAPI para obtener una sesión por request
@@ -35,5 +131,9 @@ def get_db() -> Generator[Session, None, None]:
 
 
 def init_db() -> None:
-    if should_auto_create_tables():
-        Base.metadata.create_all(bind=engine)
+    if not should_auto_create_tables():
+        return
+    if is_sharded():
+        DirectoryBase.metadata.create_all(bind=engine)
+    for shard_engine in shard_engines().values():
+        Base.metadata.create_all(bind=shard_engine)
@@ -0,0 +1,45 @@
+"""User lookup by email that works with and without SQLite sharding."""
+
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import ShardedSession, route_to_owner
+
+
+def find_user_by_email(db: Session, email: str) -> Optional[models.User]:
+    """Return the user for ``email`` and route ``db`` to its shard."""
+    if not isinstance(db, ShardedSession):
+        return db.query(models.User).filter(models.User.email == email).first()
+
+    entry = db.query(models.UserDirectory).filter(models.UserDirectory.email == email).first()
+    if entry is None:
+        return None
+    route_to_owner(db, entry.id)
+    return db.get(models.User, entry.id)
+
+
+def add_user(db: Session, email: str, hashed_password: str) -> models.User:
+    """Create and commit a user, allocating its id in the directory when sharded."""
+    if not isinstance(db, ShardedSession):
+        user = models.User(email=email, hashed_password=hashed_password)
+        db.add(user)
+        db.commit()
+        return user
+
+    entry = models.UserDirectory(email=email)
+    db.add(entry)
+    db.commit()
+    route_to_owner(db, entry.id)
+    user = models.User(id=entry.id, email=email, hashed_password=hashed_password)
+    db.add(user)
+    try:
+        db.commit()
+    except Exception:
+        # Keep the directory consistent with the shards.
+        db.rollback()
+        db.delete(db.get(models.UserDirectory, entry.id))
+        db.commit()
+        raise
+    return user
@@ -0,0 +1,202 @@
+"""Local FX rates and base-currency normalized amounts.
+
+Rates are read from a CSV kept next to the app (never from the network) and
+stored in ``fx_rates``. Every proposal keeps ``amount_minor`` (cents in its own
+currency) and ``amount_base_minor`` (cents in the base currency) so totals per
+status are a single indexed SUM.
+"""
+
+import csv
+import logging
+import math
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import BigInteger, cast, func, select, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+from . import models
+from .config import get_base_currency, get_fx_rates_file
+from .database import shard_engines, shard_session
+
+logger = logging.getLogger("freelatracker.fx")
+
+DEFAULT_MINOR_UNITS = 2
+
+Rates = Dict[str, Tuple[float, int]]
+
+
+class round_half_up(FunctionElement):
+    """``FLOOR(x + 0.5)`` in double precision: the SQL twin of :func:`to_minor`."""
+
+    type = BigInteger()
+    name = "round_half_up"
+    inherit_cache = True
+
+
+@compiles(round_half_up)
+def _compile_round_half_up(element, compiler, **kw):
+    return "FLOOR(%s + 0.5)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(round_half_up, "sqlite")
+def _compile_round_half_up_sqlite(element, compiler, **kw):
+    # SQLite's ROUND(x) is floor(x + 0.5) for x >= 0, and FLOOR may be missing.
+    return "ROUND(%s)" % compiler.process(element.clauses, **kw)
+
+
+def to_minor(amount: float, factor: float) -> int:
+    """``amount * factor`` rounded half up, exactly like ``round_half_up`` in SQL.
+
+    Python's ``round`` rounds half to even, so writes and rate reloads would
+    disagree on amounts such as 2.5 JPY.
+    """
+    return math.floor(amount * factor + 0.5)
+
+
+def normalize_currency(currency: Optional[str]) -> str:
+    return (currency or "").strip().upper()
+
+
+def read_rates_file(path: Path) -> Rates:
+    """Parse ``currency,rate,minor_units`` rows, ignoring ``#`` comments."""
+    rates: Rates = {}
+    with path.open(encoding="utf-8", newline="") as handle:
+        lines = (line for line in handle if line.strip() and not line.lstrip().startswith("#"))
+        for row in csv.DictReader(lines):
+            currency = normalize_currency(row.get("currency"))
+            if not currency:
+                continue
+            rate = float(row["rate"])
+            if rate <= 0:
+                raise ValueError(f"Tasa invalida para {currency}: {rate}")
+            raw_units = (row.get("minor_units") or "").strip()
+            minor_units = int(raw_units) if raw_units else DEFAULT_MINOR_UNITS
+            rates[currency] = (rate, minor_units)
+    return rates
+
+
+def _base_minor_units(db: Session) -> int:
+    base = db.get(models.FxRate, get_base_currency())
+    return base.minor_units if base else DEFAULT_MINOR_UNITS
+
+
+def apply_amounts(db: Session, proposal: models.Proposal) -> None:
+    """Fill the minor-unit columns of ``proposal`` from its amount and currency."""
+    fx_rate = db.get(models.FxRate, normalize_currency(proposal.currency))
+    minor_units = fx_rate.minor_units if fx_rate else DEFAULT_MINOR_UNITS
+    proposal.amount_minor = to_minor(proposal.amount, 10**minor_units)
+    if fx_rate is None:
+        proposal.amount_base_minor = None
+        return
+    proposal.amount_base_minor = to_minor(proposal.amount, fx_rate.rate * 10 ** _base_minor_units(db))
+
+
+def archived_revenue(db: Session, owner_id: int) -> Tuple[int, int]:
+    """Won amount of the owner's archived proposals in base minor units, at
+    the current rates, and how many archived proposals have no rate."""
+    won_code = models.PROPOSAL_STATUS_CODES["Aceptada"]
+    base_units = _base_minor_units(db)
+    rows = db.execute(
+        select(
+            models.ProposalRollup.status_code,
+            models.ProposalRollup.proposal_count,
+            models.ProposalRollup.amount_total,
+            models.Currency.code,
+        )
+        .join(models.Currency, models.Currency.id == models.ProposalRollup.currency_id)
+        .where(models.ProposalRollup.owner_id == owner_id)
+    ).all()
+    won = unconverted = 0
+    for status_code, count, amount, code in rows:
+        fx_rate = db.get(models.FxRate, normalize_currency(code))
+        if fx_rate is None:
+            unconverted += count
+        elif status_code == won_code:
+            won += to_minor(amount, fx_rate.rate * 10**base_units)
+    return won, unconverted
+
+
+def _recompute(db: Session, currencies: Iterable[str], base_units: int) -> None:
+    for currency in currencies:
+        fx_rate = db.get(models.FxRate, currency)
+        matches = models.Proposal.currency_id.in_(
+            select(models.Currency.id).where(func.upper(models.Currency.code) == currency)
+        )
+        if fx_rate is None:
+            db.execute(update(models.Proposal).where(matches).values(amount_base_minor=None))
+            continue
+        scale = 10**fx_rate.minor_units
+        factor = fx_rate.rate * 10**base_units
+        db.execute(
+            update(models.Proposal)
+            .where(matches)
+            .values(
+                amount_minor=cast(round_half_up(models.Proposal.amount * scale), BigInteger),
+                amount_base_minor=cast(round_half_up(models.Proposal.amount * factor), BigInteger),
+            )
+        )
+
+
+def reload_fx_rates(db: Session, rates: Rates) -> int:
+    """Make ``fx_rates`` match ``rates`` and refresh the affected proposals.
+
+    Only currencies whose rate or minor units changed are recomputed, unless
+    the base currency itself changed, which affects every converted amount.
+    Returns the number of currencies that changed.
+    """
+    existing = {row.currency: row for row in db.query(models.FxRate).all()}
+    changed = set()
+
+    for currency, (rate, minor_units) in rates.items():
+        row = existing.get(currency)
+        if row is None:
+            db.add(models.FxRate(currency=currency, rate=rate, minor_units=minor_units))
+            changed.add(currency)
+        elif row.rate != rate or row.minor_units != minor_units:
+            row.rate = rate
+            row.minor_units = minor_units
+            changed.add(currency)
+
+    for currency, row in existing.items():
+        if currency not in rates:
+            db.delete(row)
+            changed.add(currency)
+
+    if not changed:
+        return 0
+
+    db.flush()
+    if get_base_currency() in changed:
+        currencies = set(rates) | changed
+    else:
+        currencies = changed
+    _recompute(db, sorted(currencies), _base_minor_units(db))
+    db.commit()
+    return len(changed)
+
+
+def sync_fx_rates(path: Optional[Path] = None) -> int:
+    path = path or get_fx_rates_file()
+    if not path.exists():
+        logger.info("FX rates file %s not found; skipping sync", path)
+        return 0
+    rates = read_rates_file(path)
+    changed = 0
+    # Every shard keeps its own copy of the rates next to its proposals.
+    for shard in shard_engines():
+        db = shard_session(shard)
+        try:
+            changed = max(changed, reload_fx_rates(db, rates))
+        finally:
+            db.close()
+    if changed:
+        logger.info("FX rates reloaded from %s (%d currencies changed)", path, changed)
+    return changed
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    sync_fx_rates()
@@ -0,0 +1,230 @@
+"""Stored responses for ``Idempotency-Key`` retries of the proposal write routes."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Hashable, Optional, Tuple
+
+from fastapi import Header, HTTPException, Response, status
+from sqlalchemy import and_, bindparam, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_idempotency_cache_size, get_idempotency_ttl_hours
+from .database import shard_engines, shard_session
+
+logger = logging.getLogger("freelatracker.idempotency")
+
+KEY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# How often a worker sweeps all expired records of a shard while committing.
+PURGE_INTERVAL_SECONDS = 300.0
+
+IDEMPOTENCY_KEY_HEADER = Header(
+    None,
+    alias=KEY_HEADER,
+    description="Clave única por operación; los reintentos con la misma clave devuelven la respuesta original.",
+)
+
+ACTIVE_RECORD = select(models.IdempotencyRecord).where(
+    models.IdempotencyRecord.owner_id == bindparam("owner_id"),
+    models.IdempotencyRecord.key == bindparam("key"),
+    models.IdempotencyRecord.expires_at > bindparam("now"),
+)
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    body: Optional[bytes]
+    # Epoch seconds, so cache checks need no timezone handling.
+    expires_at: float
+
+    def to_response(self, replayed: bool) -> Response:
+        response = Response(
+            content=self.body or b"",
+            status_code=self.status_code,
+            media_type="application/json" if self.body else None,
+        )
+        if replayed:
+            response.headers[REPLAY_HEADER] = "true"
+        return response
+
+
+class ResponseCache:
+    """Thread-safe LRU of stored responses with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, StoredResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[StoredResponse]:
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is None:
+                return None
+            if stored.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return stored
+
+    def put(self, key: Hashable, stored: StoredResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache(get_idempotency_cache_size())
+
+_last_purge: Dict[Optional[int], float] = {}
+_purge_lock = threading.Lock()
+
+
+def _purge_due(shard: Optional[int]) -> bool:
+    now = time.monotonic()
+    with _purge_lock:
+        last = _last_purge.get(shard)
+        if last is not None and now - last < PURGE_INTERVAL_SECONDS:
+            return False
+        _last_purge[shard] = now
+        return True
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def validate_key(raw: Optional[str]) -> Optional[str]:
+    if raw is None:
+        return None
+    key = raw.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{KEY_HEADER} debe tener entre 1 y {MAX_KEY_LENGTH} caracteres.",
+        )
+    return key
+
+
+def fingerprint(method: str, path: str, payload: Optional[dict] = None) -> str:
+    body = "" if payload is None else json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{method}\n{path}\n{body}".encode("utf-8")).hexdigest()
+
+
+def _lookup(db: Session, owner_id: int, key: str) -> Optional[StoredResponse]:
+    cache_key: Tuple[int, str] = (owner_id, key)
+    stored = response_cache.get(cache_key)
+    if stored is not None:
+        return stored
+    now = datetime.now(timezone.utc)
+    record = db.execute(ACTIVE_RECORD, {"owner_id": owner_id, "key": key, "now": now}).scalar_one_or_none()
+    if record is None:
+        return None
+    stored = StoredResponse(
+        fingerprint=record.fingerprint,
+        status_code=record.status_code,
+        body=record.response_body,
+        expires_at=_as_utc(record.expires_at).timestamp(),
+    )
+    response_cache.put(cache_key, stored)
+    return stored
+
+
+def replay(db: Session, owner_id: int, key: str, request_fingerprint: str) -> Optional[Response]:
+    """The stored response for ``key``, or ``None`` when the request should run."""
+    stored = _lookup(db, owner_id, key)
+    if stored is None:
+        return None
+    if stored.fingerprint != request_fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"La {KEY_HEADER} ya se usó con una solicitud distinta.",
+        )
+    return stored.to_response(replayed=True)
+
+
+def commit(
+    db: Session,
+    owner_id: int,
+    key: str,
+    request_fingerprint: str,
+    status_code: int,
+    body: Optional[bytes],
+) -> Response:
+    """Store the response next to the pending write, commit both and return it."""
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(hours=get_idempotency_ttl_hours())
+    expired = models.IdempotencyRecord.expires_at <= now
+    if not _purge_due(db.info.get("shard")):
+        # Between sweeps only an expired record for this key matters: it
+        # would trip the unique constraint.
+        expired = and_(
+            expired,
+            models.IdempotencyRecord.owner_id == owner_id,
+            models.IdempotencyRecord.key == key,
+        )
+    db.execute(delete(models.IdempotencyRecord).where(expired).execution_options(synchronize_session=False))
+    db.add(
+        models.IdempotencyRecord(
+            owner_id=owner_id,
+            key=key,
+            fingerprint=request_fingerprint,
+            status_code=status_code,
+            response_body=body,
+            expires_at=expires_at,
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # A concurrent request with the same key won; our write was rolled back.
+        replayed = replay(db, owner_id, key, request_fingerprint)
+        if replayed is None:
+            raise
+        return replayed
+
+    stored = StoredResponse(request_fingerprint, status_code, body, expires_at.timestamp())
+    response_cache.put((owner_id, key), stored)
+    return stored.to_response(replayed=False)
+
+
+def purge_expired() -> int:
+    """Delete expired records on every shard; returns the number removed."""
+    now = datetime.now(timezone.utc)
+    removed = 0
+    for shard in shard_engines():
+        db = shard_session(shard)
+        try:
+            result = db.execute(
+                delete(models.IdempotencyRecord).where(models.IdempotencyRecord.expires_at <= now)
+            )
+            db.commit()
+            removed += result.rowcount or 0
+        finally:
+            db.close()
+    if removed:
+        logger.info("Purged %d expired idempotency keys", removed)
+    return removed
@@ -0,0 +1,161 @@
+"""Logging configuration.
+
+``plain`` mode (default) keeps the classic ``basicConfig`` stream output.
+``async`` mode makes logging non-blocking for request threads: records go to
+a bounded in-memory queue through a ``QueueHandler`` and a ``QueueListener``
+thread formats them as JSON lines and writes them to the stream. When the
+queue is full, records are dropped instead of blocking and the next record
+that gets through reports how many were lost. Records
+carrying an ``event`` extra (e.g. ``login_failed``) are rate limited per event
+so a credential-stuffing burst cannot flood the output.
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from .config import get_log_event_burst, get_log_mode
+
+PLAIN_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+LOG_QUEUE_SIZE = 10_000
+EVENT_WINDOW_SECONDS = 60.0
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id (runs in the request thread)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class EventRateLimitFilter(logging.Filter):
+    """Let through ``burst`` records per ``event`` every ``window`` seconds.
+
+    The first record after a window with suppressed records reports how many
+    were dropped in ``suppressed``.
+    """
+
+    def __init__(self, burst: int, window: float = EVENT_WINDOW_SECONDS):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._lock = threading.Lock()
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        if event is None or self.burst <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            started, count, suppressed = self._windows.get(event, (now, 0, 0))
+            if now - started >= self.window:
+                if suppressed:
+                    record.suppressed = suppressed
+                started, count, suppressed = now, 0, 0
+            if count >= self.burst:
+                self._windows[event] = (started, count, suppressed + 1)
+                return False
+            self._windows[event] = (started, count + 1, suppressed)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: a full queue drops the record."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback here, where args and exc_info are
+        # still valid; leave JSON formatting and I/O to the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.dropped:
+            record.dropped = self.dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.dropped = 0
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging() -> None:
+    global _listener
+    if get_log_mode() != "async":
+        logging.basicConfig(level=logging.INFO, format=PLAIN_FORMAT)
+        return
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter())
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(EventRateLimitFilter(get_log_event_burst()))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(logging.INFO)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
@@ -0,0 +1,45 @@
+"""Interning of the platform and currency strings stored on proposals."""
+
+from typing import Type, TypeVar
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+
+LookupModel = TypeVar("LookupModel", models.Platform, models.Currency)
+
+
+def _intern(db: Session, model: Type[LookupModel], field: str, value: str) -> LookupModel:
+    column = getattr(model, field)
+    row = db.query(model).filter(column == value).first()
+    if row is not None:
+        return row
+
+    row = model(**{field: value})
+    try:
+        with db.begin_nested():
+            db.add(row)
+    except IntegrityError:
+        # Another request created the same value between our SELECT and INSERT.
+        row = db.query(model).filter(column == value).one()
+    return row
+
+
+def intern_platform(db: Session, name: str) -> models.Platform:
+    return _intern(db, models.Platform, "name", name)
+
+
+def intern_currency(db: Session, code: str) -> models.Currency:
+    return _intern(db, models.Currency, "code", code)
+
+
+def apply_proposal_fields(db: Session, proposal: models.Proposal, data: dict) -> None:
+    """Set validated schema fields on ``proposal``, resolving lookup ids."""
+    for field, value in data.items():
+        if field == "platform":
+            proposal.platform_ref = intern_platform(db, value)
+        elif field == "currency":
+            proposal.currency_ref = intern_currency(db, value)
+        else:
+            setattr(proposal, field, value)
@@ -1,5 +1,6 @@
 import logging
 from contextlib import asynccontextmanager
+from uuid import uuid4
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -9,23 +10,29 @@ from fastapi.templating import Jinja2Templates
 
 from .config import get_cors_origins, get_secret_key
 from .database import init_db
-from . import models
-from .routers import auth, proposals
+from . import archive, fx, idempotency, models, profiling, write_queue
+from .logging_setup import configure_logging, request_id_var
+from .routers import archive as archive_router, auth, dashboard, proposals
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
-)
+configure_logging()
 logger = logging.getLogger("freelatracker")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    fx.sync_fx_rates()
+    idempotency.purge_expired()
+    write_queue.start_write_queue()
+    archive.start_archive_scheduler()
     yield
+    archive.stop_archive_scheduler()
+    write_queue.stop_write_queue()
 
 
 app = FastAPI(title="FreelaTracker API", lifespan=lifespan)
+# Innermost middleware, so the profile only covers the request itself.
+profiling.install(app)
 
 allowed_origins = get_cors_origins()
 # Validar que el secreto este definido al iniciar
@@ -37,9 +44,26 @@ app.add_middleware(
     allow_origins=allowed_origins,
     allow_credentials=False,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "Accept"],
+    allow_headers=[
+        "Authorization",
+        "Content-Type",
+        "Accept",
+        "X-Request-ID",
+        "Idempotency-Key",
+    ],
 )
 
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    # Not reset afterwards: each request runs in its own task context, and the
+    # unhandled-exception handler runs outside this middleware but still needs it.
+    request_id = request.headers.get("X-Request-ID", "")[:64] or uuid4().hex
+    request_id_var.set(request_id)
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # Archivos estáticos (CSS, JS, etc.)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -54,7 +78,9 @@ def home(request: Request):
 
 # Routers de la API
 app.include_router(auth.router)
+app.include_router(archive_router.router)
 app.include_router(proposals.router)
+app.include_router(dashboard.router)
 
 
 @app.exception_handler(Exception)
@@ -1,9 +1,31 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
-from .database import Base
+from .database import Base, DirectoryBase
+
+# Stable codes stored in proposals.status_code. Never renumber; only append.
+PROPOSAL_STATUS_CODES = {
+    "Enviada": 1,
+    "En negociacion": 2,
+    "Aceptada": 3,
+    "Rechazada": 4,
+    "Borrador": 5,
+}
+PROPOSAL_STATUS_NAMES = {code: name for name, code in PROPOSAL_STATUS_CODES.items()}
 
 
 class User(Base):
@@ -21,22 +43,48 @@ class User(Base):
     )
 
 
-class Proposal(Base):
+class ProposalLabelsMixin:
+    """String views of the coded columns, as exposed by schemas.ProposalOut."""
+
+    @property
+    def platform(self) -> str:
+        return self.platform_ref.name
+
+    @property
+    def currency(self) -> str:
+        return self.currency_ref.code
+
+    @property
+    def status(self) -> str:
+        return PROPOSAL_STATUS_NAMES[self.status_code]
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self.status_code = PROPOSAL_STATUS_CODES[value]
+
+
+class Proposal(ProposalLabelsMixin, Base):
     __tablename__ = "proposals"
     __table_args__ = (
         # Optimized lookups for owner-scoped listings and aggregations.
         Index("ix_proposals_owner_created", "owner_id", "created_at"),
-        Index("ix_proposals_owner_status", "owner_id", "status"),
+        # Covers status counts and revenue totals so stats never touch the table.
+        Index("ix_proposals_owner_status_base", "owner_id", "status_code", "amount_base_minor"),
+        # Archived ids must never be handed out again (see app/archive.py).
+        {"sqlite_autoincrement": True},
     )
 
     id = Column(Integer, primary_key=True, index=True)
     client_name = Column(String(120), nullable=False)
-    platform = Column(String(80), nullable=False)
+    platform_id = Column(Integer, ForeignKey("platforms.id"), nullable=False)
     project_title = Column(String(180), nullable=False)
     project_link = Column(String(500), nullable=True)
     amount = Column(Float, nullable=False)
-    currency = Column(String(10), default="USD")
-    status = Column(String(32), default="Enviada", index=True)
+    # Integer minor units (cents) of ``amount`` and its value in the base currency.
+    amount_minor = Column(BigInteger, nullable=True)
+    amount_base_minor = Column(BigInteger, nullable=True)
+    currency_id = Column(Integer, ForeignKey("currencies.id"), nullable=False)
+    status_code = Column(SmallInteger, nullable=False, default=PROPOSAL_STATUS_CODES["Enviada"])
     notes = Column(String(500), nullable=True)
     created_at = Column(
         DateTime(timezone=True),
@@ -46,6 +94,76 @@ class Proposal(Base):
 
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     owner = relationship("User", back_populates="proposals")
+    platform_ref = relationship("Platform", lazy="joined")
+    currency_ref = relationship("Currency", lazy="joined")
+
+
+class ArchivedProposal(ProposalLabelsMixin, Base):
+    """Closed proposal moved out of ``proposals`` by ``app.archive``; keeps its id."""
+
+    __tablename__ = "proposals_archive"
+    __table_args__ = (Index("ix_proposals_archive_owner_created", "owner_id", "created_at"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    client_name = Column(String(120), nullable=False)
+    platform_id = Column(Integer, ForeignKey("platforms.id"), nullable=False)
+    project_title = Column(String(180), nullable=False)
+    project_link = Column(String(500), nullable=True)
+    amount = Column(Float, nullable=False)
+    amount_minor = Column(BigInteger, nullable=True)
+    amount_base_minor = Column(BigInteger, nullable=True)
+    currency_id = Column(Integer, ForeignKey("currencies.id"), nullable=False)
+    status_code = Column(SmallInteger, nullable=False)
+    notes = Column(String(500), nullable=True)
+    created_at = Column(DateTime(timezone=True))
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    archived_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    platform_ref = relationship("Platform", lazy="joined")
+    currency_ref = relationship("Currency", lazy="joined")
+
+
+class ProposalRollup(Base):
+    """Per-owner totals of the archived proposals, by status and currency.
+
+    Amounts stay in the proposal's own currency so revenue in the base
+    currency follows fx rate reloads, like ``amount_base_minor`` does.
+    """
+
+    __tablename__ = "proposal_rollups"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    status_code = Column(SmallInteger, primary_key=True)
+    currency_id = Column(Integer, ForeignKey("currencies.id"), primary_key=True)
+    proposal_count = Column(Integer, nullable=False, default=0)
+    amount_total = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    currency_ref = relationship("Currency", lazy="joined")
+
+
+# Lookup tables so each proposal row stores small ids instead of repeated strings.
+class Platform(Base):
+    __tablename__ = "platforms"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(80), unique=True, nullable=False)
+
+
+class Currency(Base):
+    __tablename__ = "currencies"
+
+    id = Column(Integer, primary_key=True)
+    code = Column(String(10), unique=True, nullable=False)
 
 
 class RevokedToken(Base):
@@ -59,3 +177,57 @@ class RevokedToken(Base):
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
+
+
+class IdempotencyRecord(Base):
+    """Response stored for an ``Idempotency-Key`` sent to a proposal write route."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("owner_id", "key", name="uq_idempotency_keys_owner_key"),)
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+    # sha256 of method, path and canonical JSON body.
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(SmallInteger, nullable=False)
+    response_body = Column(LargeBinary, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class FxRate(Base):
+    __tablename__ = "fx_rates"
+
+    # Units of the base currency per unit of ``currency``.
+    currency = Column(String(10), primary_key=True)
+    rate = Column(Float, nullable=False)
+    minor_units = Column(Integer, nullable=False, default=2)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+class UserDirectory(DirectoryBase):
+    """Global email -> user id map used only when SQLite sharding is enabled.
+
+    The id allocated here is the user's id in its shard, so the shard can be
+    derived from the token's ``sub`` without touching the directory.
+    """
+
+    __tablename__ = "user_directory"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String(255), unique=True, index=True, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
@@ -0,0 +1,200 @@
+"""On-demand stack and SQL profiling of single requests sent with ``X-Profile-Token``.
+
+Nothing is installed unless profiling is enabled and a token is configured.
+"""
+
+import contextvars
+import hmac
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import get_profile_dir, get_profiling_token, is_profiling_enabled
+from .logging_setup import request_id_var
+
+logger = logging.getLogger("freelatracker.profiling")
+
+PROFILE_HEADER = "X-Profile-Token"
+SAMPLE_INTERVAL_SECONDS = 0.001
+TOP_STATEMENTS = 20
+
+# Leaf frames of threads that are parked, not working.
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+
+class StackSampler:
+    """Collect collapsed stacks of the ``threads`` idents every ``interval`` seconds.
+
+    ``threads`` may grow while sampling, as the request reaches new workers.
+    """
+
+    def __init__(self, threads: Set[int], interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.threads = threads
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in tuple(self.threads):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                code = frame.f_code
+                if (Path(code.co_filename).name, code.co_name) in _IDLE_FRAMES:
+                    continue
+                labels: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    labels.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(labels))] += 1
+                self.samples += 1
+
+
+class SqlTimer:
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.by_statement: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        entry = self.by_statement[" ".join(statement.split())]
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def summary(self) -> dict:
+        top = sorted(self.by_statement.items(), key=lambda item: item[1][1], reverse=True)[:TOP_STATEMENTS]
+        return {
+            "count": self.count,
+            "ms": round(self.seconds * 1000, 3),
+            "statements": [
+                {"sql": sql, "count": count, "ms": round(seconds * 1000, 3)} for sql, (count, seconds) in top
+            ],
+        }
+
+
+class RequestProfile:
+    def __init__(self) -> None:
+        self.timer = SqlTimer()
+        # Threadpool workers that ran this request's statements; only these are sampled.
+        self.threads: Set[int] = set()
+
+
+# Set only while a profiled request runs; copied into threadpool workers.
+_profile_var: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar("profile", default=None)
+_profile_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _profile_var.get()
+    if profile is not None:
+        profile.threads.add(threading.get_ident())
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _profile_var.get()
+    if profile is None:
+        return
+    starts = conn.info.get("profile_query_start")
+    if starts:
+        profile.timer.record(statement, time.perf_counter() - starts.pop())
+
+
+def _profile_name(method: str, route: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    return f"{stamp}-{method.lower()}-{slug}"
+
+
+def _write_profile(directory: Path, name: str, sampler: StackSampler, metadata: dict) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    folded = "\n".join(f"{stack} {count}" for stack, count in sampler.stacks.most_common())
+    (directory / f"{name}.folded").write_text(folded + "\n", encoding="utf-8")
+    (directory / f"{name}.json").write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+
+
+async def profile_middleware(request: Request, call_next):
+    token = request.headers.get(PROFILE_HEADER)
+    # Header values decode as latin-1; str comparison rejects non-ASCII with TypeError.
+    if not token or not hmac.compare_digest(token.encode("latin-1"), get_profiling_token().encode("utf-8")):
+        return await call_next(request)
+    # One profile at a time keeps the sampler's view of the worker readable.
+    if not _profile_lock.acquire(blocking=False):
+        return await call_next(request)
+
+    profile = RequestProfile()
+    timer = profile.timer
+    reset_token = _profile_var.set(profile)
+    sampler = StackSampler(profile.threads)
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        response = await call_next(request)
+    finally:
+        sampler.stop()
+        _profile_var.reset(reset_token)
+        _profile_lock.release()
+    wall = time.perf_counter() - started
+
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    name = _profile_name(request.method, route)
+    metadata = {
+        "route": route,
+        "method": request.method,
+        "path": request.url.path,
+        "status": response.status_code,
+        "request_id": request_id_var.get(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "wall_ms": round(wall * 1000, 3),
+        "samples": sampler.samples,
+        "sample_interval_ms": sampler.interval * 1000,
+        "sql": timer.summary(),
+    }
+    try:
+        _write_profile(get_profile_dir(), name, sampler, metadata)
+    except OSError:
+        logger.exception("Could not save profile %s", name)
+    else:
+        logger.info("Saved profile %s (%.1f ms, %d SQL)", name, wall * 1000, timer.count)
+        response.headers["X-Profile-Id"] = name
+    return response
+
+
+def install(app) -> bool:
+    """Register the middleware and SQL timers when profiling is configured."""
+    if not is_profiling_enabled():
+        return False
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.middleware("http")(profile_middleware)
+    return True
@@ -0,0 +1,44 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import models, queries, schemas
+from ..database import get_db
+from .auth import get_current_user
+
+# Included before the proposals router, whose ``/{proposal_id}`` would
+# otherwise capture ``/proposals/archive``.
+router = APIRouter(
+    prefix="/proposals/archive",
+    tags=["archive"],
+)
+
+ARCHIVE_PAGE_SIZE = 50
+ARCHIVE_MAX_PAGE_SIZE = 200
+
+
+@router.get("/", response_model=List[schemas.ArchivedProposalOut])
+def list_archived_proposals(
+    limit: int = Query(ARCHIVE_PAGE_SIZE, ge=1, le=ARCHIVE_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Closed proposals moved out of the hot table, newest first."""
+    return queries.list_owner_archived_proposals(db, current_user.id, limit, offset)
+
+
+@router.get("/{proposal_id}", response_model=schemas.ArchivedProposalOut)
+def get_archived_proposal(
+    proposal_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    proposal = queries.get_owner_archived_proposal(db, current_user.id, proposal_id)
+    if not proposal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Propuesta archivada no encontrada.",
+        )
+    return proposal
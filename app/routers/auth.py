@@ -10,10 +10,10 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
-from .. import models, schemas
+from .. import directory, models, queries, schemas
 from ..auth_utils import ALGORITHM, create_access_token, get_password_hash, verify_password
 from ..config import get_access_token_exp_minutes, get_secret_key
-from ..database import get_db
+from ..database import get_db, route_to_owner
 
 router = APIRouter(
     prefix="/auth",
@@ -53,13 +53,7 @@ def _reset_attempts(identifier: str) -> None:
 def _is_token_revoked(db: Session, jti: Optional[str]) -> bool:
     if not jti:
         return False
-    now = datetime.now(timezone.utc)
-    return (
-        db.query(models.RevokedToken)
-        .filter(models.RevokedToken.jti == jti, models.RevokedToken.expires_at > now)
-        .first()
-        is not None
-    )
+    return queries.is_jti_revoked(db, jti)
 
 
 def _revoke_token(db: Session, jti: str, expires_at: datetime) -> None:
@@ -76,7 +70,7 @@ def _revoke_token(db: Session, jti: str, expires_at: datetime) -> None:
 @router.post("/register", response_model=schemas.UserOut)
 def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
     email = user_in.email.strip().lower()
-    existing = db.query(models.User).filter(models.User.email == email).first()
+    existing = directory.find_user_by_email(db, email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,12 +79,7 @@ def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
 
     hashed_pw = get_password_hash(user_in.password)
 
-    user = models.User(
-        email=email,
-        hashed_password=hashed_pw,
-    )
-    db.add(user)
-    db.commit()
+    user = directory.add_user(db, email, hashed_pw)
     logger.info("User registered: %s", user.email)
     return user
 
@@ -104,16 +93,21 @@ def login(
     email = form_data.username.strip().lower()
     client_id = request.client.host if request and request.client else "unknown"
     if _is_rate_limited(client_id):
-        logger.warning("Login rate limited for %s", client_id)
+        logger.warning("Login rate limited for %s", client_id, extra={"event": "login_rate_limited"})
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Demasiados intentos. Intenta de nuevo en unos minutos.",
         )
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = directory.find_user_by_email(db, email)
     if not user or not verify_password(form_data.password, user.hashed_password):
         _record_failed_attempt(client_id)
-        logger.warning("Invalid credentials for %s from %s", email, client_id)
+        logger.warning(
+            "Invalid credentials for %s from %s",
+            email,
+            client_id,
+            extra={"event": "login_failed"},
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas.",
@@ -126,7 +120,7 @@ def login(
         expires_delta=access_token_expires,
     )
     _reset_attempts(client_id)
-    logger.info("Login success for %s from %s", email, client_id)
+    logger.info("Login success for %s from %s", email, client_id, extra={"event": "login_success"})
 
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -151,7 +145,8 @@ def get_current_user(
     except (JWTError, ValueError):
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    route_to_owner(db, user_id)
+    user = queries.get_user(db, user_id)
     if user is None:
         raise credentials_exception
     if _is_token_revoked(db, jti):
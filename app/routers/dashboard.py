@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..queries import owner_archived_stats, status_case
+from ..database import get_db
+from .auth import get_current_user
+from .proposals import build_stats
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["dashboard"],
+)
+
+DASHBOARD_PAGE_SIZE = 50
+DASHBOARD_MAX_PAGE_SIZE = 200
+
+
+@router.get("/bootstrap", response_model=schemas.DashboardBootstrap)
+def bootstrap(
+    limit: int = Query(DASHBOARD_PAGE_SIZE, ge=1, le=DASHBOARD_MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Everything the dashboard needs on load, authenticated once.
+
+    The stats are computed with window aggregates over the owner's rows and
+    travel alongside the first page of proposals; archived proposals are
+    added from their rollups, so the payload costs two small queries after
+    authentication.
+    """
+    rows = (
+        db.query(
+            models.Proposal,
+            func.count(models.Proposal.id).over(),
+            func.sum(status_case(schemas.ProposalStatus.ACEPTADA.value)).over(),
+            func.sum(status_case(schemas.ProposalStatus.RECHAZADA.value)).over(),
+        )
+        .filter(models.Proposal.owner_id == current_user.id)
+        .order_by(models.Proposal.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+    if rows:
+        _, total, accepted, rejected = rows[0]
+    else:
+        total = accepted = rejected = 0
+    archived_total, archived_accepted, archived_rejected = owner_archived_stats(db, current_user.id)
+
+    return {
+        "user": current_user,
+        "proposals": [row[0] for row in rows],
+        "stats": build_stats(
+            int(total) + int(archived_total),
+            int(accepted or 0) + int(archived_accepted),
+            int(rejected or 0) + int(archived_rejected),
+        ),
+    }
@@ -1,11 +1,12 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 from sqlalchemy import case, func
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload, load_only, noload
 
-from .. import models, schemas
+from .. import fx, idempotency, lookups, models, queries, schemas, write_queue
+from ..config import get_base_currency
 from ..database import get_db
 from .auth import get_current_user
 
@@ -14,56 +15,119 @@ router = APIRouter(
     tags=["proposals"],
 )
 
+# Columns each public field needs; platform and currency also need their lookup row.
+FIELD_COLUMNS = {
+    "id": (models.Proposal.id,),
+    "owner_id": (models.Proposal.owner_id,),
+    "client_name": (models.Proposal.client_name,),
+    "platform": (models.Proposal.platform_id,),
+    "project_title": (models.Proposal.project_title,),
+    "project_link": (models.Proposal.project_link,),
+    "amount": (models.Proposal.amount,),
+    "currency": (models.Proposal.currency_id,),
+    "status": (models.Proposal.status_code,),
+    "notes": (models.Proposal.notes,),
+}
+FIELD_RELATIONSHIPS = {
+    "platform": models.Proposal.platform_ref,
+    "currency": models.Proposal.currency_ref,
+}
+FIELDS_QUERY = Query(
+    None,
+    description="Lista separada por comas de campos a devolver (el id siempre se incluye).",
+)
+
+
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    if raw is None:
+        return None
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in schemas.PROPOSAL_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos desconocidos: {', '.join(unknown)}.",
+        )
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+def projection_options(fields: Tuple[str, ...]) -> list:
+    """Load only the columns behind ``fields`` and skip unused lookup joins."""
+    options = [load_only(*(column for name in fields for column in FIELD_COLUMNS[name]))]
+    for name, relationship in FIELD_RELATIONSHIPS.items():
+        options.append(joinedload(relationship) if name in fields else noload(relationship))
+    return options
+
+
+def fields_response(fields: Tuple[str, ...], data) -> Response:
+    adapter = schemas.proposal_fields_adapter(fields, isinstance(data, list))
+    return Response(content=adapter.dump_json(adapter.validate_python(data)), media_type="application/json")
+
 
 @router.post("/", response_model=schemas.ProposalOut)
 def create_proposal(
     proposal_in: schemas.ProposalCreate,
+    idempotency_key: Optional[str] = idempotency.IDEMPOTENCY_KEY_HEADER,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     payload = proposal_in.model_dump(mode="json")
-    proposal = models.Proposal(
-        **payload,
-        owner_id=current_user.id,
-    )
+    key = idempotency.validate_key(idempotency_key)
+    if key is not None:
+        fingerprint = idempotency.fingerprint("POST", "/proposals/", payload)
+        replayed = idempotency.replay(db, current_user.id, key, fingerprint)
+        if replayed is not None:
+            return replayed
+
+    # Keyed creates skip the write queue: the row and its stored response
+    # must commit in the same transaction.
+    writer = write_queue.get_write_queue()
+    if writer is not None and key is None:
+        return writer.submit(payload, current_user.id)
+
+    proposal = models.Proposal(owner_id=current_user.id)
+    lookups.apply_proposal_fields(db, proposal, payload)
+    fx.apply_amounts(db, proposal)
     db.add(proposal)
-    db.commit()
-    return proposal
+    if key is None:
+        db.commit()
+        return proposal
+    db.flush()
+    body = schemas.ProposalOut.model_validate(proposal).model_dump_json().encode("utf-8")
+    return idempotency.commit(db, current_user.id, key, fingerprint, status.HTTP_200_OK, body)
 
 
 @router.get("/", response_model=List[schemas.ProposalOut])
 def list_proposals(
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    proposals = (
-        db.query(models.Proposal)
-        .filter(models.Proposal.owner_id == current_user.id)
-        .order_by(models.Proposal.created_at.desc())
-        .all()
-    )
+    selected = parse_fields(fields)
+    options = projection_options(selected) if selected else ()
+    proposals = queries.list_owner_proposals(db, current_user.id, options)
+    if selected:
+        return fields_response(selected, proposals)
     return proposals
 
 
 @router.get("/{proposal_id}", response_model=schemas.ProposalOut)
 def get_proposal(
     proposal_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    proposal = (
-        db.query(models.Proposal)
-        .filter(
-            models.Proposal.id == proposal_id,
-            models.Proposal.owner_id == current_user.id,
-        )
-        .first()
-    )
+    selected = parse_fields(fields)
+    options = projection_options(selected) if selected else ()
+    proposal = queries.get_owner_proposal(db, current_user.id, proposal_id, options)
     if not proposal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Propuesta no encontrada.",
         )
+    if selected:
+        return fields_response(selected, proposal)
     return proposal
 
 
@@ -71,45 +135,52 @@ def get_proposal(
 def update_proposal(
     proposal_id: int,
     proposal_in: schemas.ProposalUpdate,
+    idempotency_key: Optional[str] = idempotency.IDEMPOTENCY_KEY_HEADER,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    proposal = (
-        db.query(models.Proposal)
-        .filter(
-            models.Proposal.id == proposal_id,
-            models.Proposal.owner_id == current_user.id,
-        )
-        .first()
-    )
+    update_data = proposal_in.model_dump(exclude_unset=True, mode="json")
+    key = idempotency.validate_key(idempotency_key)
+    if key is not None:
+        fingerprint = idempotency.fingerprint("PUT", f"/proposals/{proposal_id}", update_data)
+        replayed = idempotency.replay(db, current_user.id, key, fingerprint)
+        if replayed is not None:
+            return replayed
+
+    proposal = queries.get_owner_proposal(db, current_user.id, proposal_id)
     if not proposal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Propuesta no encontrada.",
         )
 
-    update_data = proposal_in.model_dump(exclude_unset=True, mode="json")
-    for field, value in update_data.items():
-        setattr(proposal, field, value)
+    lookups.apply_proposal_fields(db, proposal, update_data)
+    if "amount" in update_data or "currency" in update_data:
+        fx.apply_amounts(db, proposal)
 
-    db.commit()
-    return proposal
+    if key is None:
+        db.commit()
+        return proposal
+    db.flush()
+    body = schemas.ProposalOut.model_validate(proposal).model_dump_json().encode("utf-8")
+    return idempotency.commit(db, current_user.id, key, fingerprint, status.HTTP_200_OK, body)
 
 
 @router.delete("/{proposal_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_proposal(
     proposal_id: int,
+    idempotency_key: Optional[str] = idempotency.IDEMPOTENCY_KEY_HEADER,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    proposal = (
-        db.query(models.Proposal)
-        .filter(
-            models.Proposal.id == proposal_id,
-            models.Proposal.owner_id == current_user.id,
-        )
-        .first()
-    )
+    key = idempotency.validate_key(idempotency_key)
+    if key is not None:
+        fingerprint = idempotency.fingerprint("DELETE", f"/proposals/{proposal_id}")
+        replayed = idempotency.replay(db, current_user.id, key, fingerprint)
+        if replayed is not None:
+            return replayed
+
+    proposal = queries.get_owner_proposal(db, current_user.id, proposal_id)
     if not proposal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,8 +188,23 @@ def delete_proposal(
         )
 
     db.delete(proposal)
-    db.commit()
-    return None
+    if key is None:
+        db.commit()
+        return None
+    return idempotency.commit(db, current_user.id, key, fingerprint, status.HTTP_204_NO_CONTENT, None)
+
+
+def build_stats(total: int, accepted: int, rejected: int) -> dict:
+    pending = max(total - accepted - rejected, 0)
+    conversion = (accepted / total * 100.0) if total else 0.0
+
+    return {
+        "total": total,
+        "accepted": accepted,
+        "rejected": rejected,
+        "pending": pending,
+        "conversion_percent": round(conversion, 2),
+    }
 
 
 @router.get("/stats/basic", response_model=dict)
@@ -126,13 +212,29 @@ def basic_stats(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    total, accepted, rejected = (
+    total, accepted, rejected = queries.owner_all_time_stats(db, current_user.id)
+
+    return build_stats(total, accepted, rejected)
+
+
+@router.get("/stats/revenue", response_model=dict)
+def revenue_stats(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """All-time won and pipeline totals across currencies, in the base currency."""
+    pipeline_codes = (
+        models.PROPOSAL_STATUS_CODES[schemas.ProposalStatus.ENVIADA.value],
+        models.PROPOSAL_STATUS_CODES[schemas.ProposalStatus.EN_NEGOCIACION.value],
+    )
+    won_code = models.PROPOSAL_STATUS_CODES[schemas.ProposalStatus.ACEPTADA.value]
+    base_amount = models.Proposal.amount_base_minor
+    won, pipeline, unconverted = (
         db.query(
-            func.count(models.Proposal.id),
             func.coalesce(
                 func.sum(
                     case(
-                        (models.Proposal.status == schemas.ProposalStatus.ACEPTADA.value, 1),
+                        (models.Proposal.status_code == won_code, base_amount),
                         else_=0,
                     )
                 ),
@@ -141,24 +243,31 @@ def basic_stats(
             func.coalesce(
                 func.sum(
                     case(
-                        (models.Proposal.status == schemas.ProposalStatus.RECHAZADA.value, 1),
+                        (models.Proposal.status_code.in_(pipeline_codes), base_amount),
                         else_=0,
                     )
                 ),
                 0,
             ),
+            func.coalesce(
+                func.sum(case((base_amount.is_(None), 1), else_=0)),
+                0,
+            ),
         )
         .filter(models.Proposal.owner_id == current_user.id)
         .one()
     )
 
-    pending = max(total - accepted - rejected, 0)
-    conversion = (accepted / total * 100.0) if total else 0.0
+    # Archived proposals are closed, so they only add to won and unconverted.
+    archived_won, archived_unconverted = fx.archived_revenue(db, current_user.id)
+
+    base_currency = get_base_currency()
+    base_rate = db.get(models.FxRate, base_currency)
+    scale = 10 ** (base_rate.minor_units if base_rate else fx.DEFAULT_MINOR_UNITS)
 
     return {
-        "total": total,
-        "accepted": accepted,
-        "rejected": rejected,
-        "pending": pending,
-        "conversion_percent": round(conversion, 2),
+        "base_currency": base_currency,
+        "won": (won + archived_won) / scale,
+        "pipeline": pipeline / scale,
+        "unconverted": unconverted + archived_unconverted,
     }
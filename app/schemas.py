@@ -1,7 +1,9 @@
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
 
-from pydantic import BaseModel, EmailStr, HttpUrl, confloat, constr, field_validator, ConfigDict
+from pydantic import BaseModel, EmailStr, HttpUrl, TypeAdapter, confloat, constr, create_model, field_validator, ConfigDict
 
 
 # -------- Usuarios --------
@@ -85,3 +87,35 @@ class ProposalOut(ProposalBase):
 
     id: int
     owner_id: int
+
+
+PROPOSAL_FIELDS = tuple(ProposalOut.model_fields)
+
+
+class ArchivedProposalOut(ProposalOut):
+    created_at: Optional[datetime] = None
+    archived_at: datetime
+
+
+@lru_cache(maxsize=128)
+def proposal_fields_schema(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """ProposalOut trimmed to ``fields`` (for ``?fields=`` sparse reads)."""
+    return create_model(
+        "ProposalFieldsOut",
+        __config__=ConfigDict(from_attributes=True, use_enum_values=True),
+        **{name: (ProposalOut.model_fields[name].annotation, ProposalOut.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=128)
+def proposal_fields_adapter(fields: Tuple[str, ...], many: bool) -> TypeAdapter:
+    schema = proposal_fields_schema(fields)
+    return TypeAdapter(List[schema] if many else schema)
+
+
+# -------- Dashboard --------
+
+class DashboardBootstrap(BaseModel):
+    user: UserOut
+    proposals: List[ProposalOut]
+    stats: dict
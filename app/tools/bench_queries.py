@@ -0,0 +1,154 @@
+"""Micro-benchmark: per-call ``db.query(...)`` chains vs. the prebuilt statements.
+
+Usage::
+
+    python -m app.tools.bench_queries --iterations 5000
+
+Runs against a private in-memory SQLite database with a handful of rows, so
+the numbers are dominated by Python-side statement construction and
+compilation rather than by I/O.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from .. import models, queries, schemas
+from ..database import Base
+
+
+def _legacy_user(db: Session, user_id: int, proposal_id: int):
+    return db.query(models.User).filter(models.User.id == user_id).first()
+
+
+def _legacy_revoked(db: Session, user_id: int, proposal_id: int):
+    now = datetime.now(timezone.utc)
+    return (
+        db.query(models.RevokedToken.id)
+        .filter(models.RevokedToken.jti == "missing", models.RevokedToken.expires_at > now)
+        .first()
+        is not None
+    )
+
+
+def _legacy_proposal(db: Session, user_id: int, proposal_id: int):
+    return (
+        db.query(models.Proposal)
+        .filter(models.Proposal.id == proposal_id, models.Proposal.owner_id == user_id)
+        .first()
+    )
+
+
+def _legacy_list(db: Session, user_id: int, proposal_id: int):
+    return (
+        db.query(models.Proposal)
+        .filter(models.Proposal.owner_id == user_id)
+        .order_by(models.Proposal.created_at.desc())
+        .all()
+    )
+
+
+def _legacy_stats(db: Session, user_id: int, proposal_id: int):
+    return (
+        db.query(
+            func.count(models.Proposal.id),
+            queries.status_count(schemas.ProposalStatus.ACEPTADA.value),
+            queries.status_count(schemas.ProposalStatus.RECHAZADA.value),
+        )
+        .filter(models.Proposal.owner_id == user_id)
+        .one()
+    )
+
+
+CASES: Dict[str, Tuple[Callable, Callable]] = {
+    "user by id": (_legacy_user, lambda db, uid, pid: queries.get_user(db, uid)),
+    "revoked jti": (_legacy_revoked, lambda db, uid, pid: queries.is_jti_revoked(db, "missing")),
+    "proposal by id": (_legacy_proposal, lambda db, uid, pid: queries.get_owner_proposal(db, uid, pid)),
+    "list proposals": (_legacy_list, lambda db, uid, pid: queries.list_owner_proposals(db, uid)),
+    "stats": (_legacy_stats, lambda db, uid, pid: queries.owner_stats(db, uid)),
+}
+
+
+def _setup() -> Tuple[sessionmaker, int, int]:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    db = factory()
+    user = models.User(email="bench@example.com", hashed_password="x")
+    platform = models.Platform(name="Workana")
+    currency = models.Currency(code="USD")
+    db.add_all([user, platform, currency])
+    db.flush()
+    for idx in range(10):
+        db.add(
+            models.Proposal(
+                client_name=f"C{idx}",
+                project_title="P",
+                amount=10.0,
+                owner_id=user.id,
+                platform_id=platform.id,
+                currency_id=currency.id,
+                status_code=models.PROPOSAL_STATUS_CODES["Aceptada"],
+            )
+        )
+    db.commit()
+    proposal_id = db.query(models.Proposal.id).first()[0]
+    user_id = user.id
+    db.close()
+    return factory, user_id, proposal_id
+
+
+def _time(factory: sessionmaker, fn: Callable, user_id: int, proposal_id: int, iterations: int) -> float:
+    db = factory()
+    try:
+        for _ in range(50):
+            fn(db, user_id, proposal_id)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn(db, user_id, proposal_id)
+            db.expunge_all()
+        return (time.perf_counter() - started) / iterations * 1e6
+    finally:
+        db.close()
+
+
+def run(iterations: int) -> Dict[str, Tuple[float, float]]:
+    """Microseconds per call, ``(legacy, prebuilt)``, for each hot query."""
+    factory, user_id, proposal_id = _setup()
+    return {
+        name: (
+            _time(factory, legacy, user_id, proposal_id, iterations),
+            _time(factory, prebuilt, user_id, proposal_id, iterations),
+        )
+        for name, (legacy, prebuilt) in CASES.items()
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compara consultas construidas por llamada vs precompiladas.")
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations)
+    print(f"{'consulta':<16}{'query() us':>12}{'prebuilt us':>13}{'ahorro':>9}")
+    for name, (legacy, prebuilt) in results.items():
+        print(f"{name:<16}{legacy:>12.1f}{prebuilt:>13.1f}{(1 - prebuilt / legacy) * 100:>8.0f}%")
+    # A typical authenticated request: user + revoked check + one proposal read.
+    request_names = ("user by id", "revoked jti", "proposal by id")
+    saved = sum(results[name][0] - results[name][1] for name in request_names)
+    print(f"Ahorro por request autenticada (usuario + jti + propuesta): {saved:.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
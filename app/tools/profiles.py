@@ -0,0 +1,96 @@
+"""Per-route summary of the profiles saved by ``app.profiling``.
+
+Usage: ``python -m app.tools.profiles [--dir profiles] [--merge-out merged/]``
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config import get_profile_dir
+
+RouteKey = Tuple[str, str]
+
+
+def load_profiles(directory: Path) -> Dict[RouteKey, List[Tuple[dict, Path]]]:
+    grouped: Dict[RouteKey, List[Tuple[dict, Path]]] = defaultdict(list)
+    for meta_path in sorted(directory.glob("*.json")):
+        try:
+            metadata = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        key = (metadata.get("method", "?"), metadata.get("route", "?"))
+        grouped[key].append((metadata, meta_path.with_suffix(".folded")))
+    return grouped
+
+
+def summarize(grouped: Dict[RouteKey, List[Tuple[dict, Path]]]) -> List[dict]:
+    rows = []
+    for (method, route), entries in grouped.items():
+        walls = [metadata["wall_ms"] for metadata, _ in entries]
+        sql_ms = [metadata["sql"]["ms"] for metadata, _ in entries]
+        sql_count = [metadata["sql"]["count"] for metadata, _ in entries]
+        rows.append(
+            {
+                "method": method,
+                "route": route,
+                "profiles": len(entries),
+                "wall_ms_mean": statistics.fmean(walls),
+                "wall_ms_p50": statistics.median(walls),
+                "wall_ms_max": max(walls),
+                "sql_ms_mean": statistics.fmean(sql_ms),
+                "sql_count_mean": statistics.fmean(sql_count),
+            }
+        )
+    return sorted(rows, key=lambda row: row["wall_ms_mean"], reverse=True)
+
+
+def merge_stacks(entries: List[Tuple[dict, Path]]) -> Counter:
+    merged: Counter = Counter()
+    for _, folded_path in entries:
+        if not folded_path.exists():
+            continue
+        for line in folded_path.read_text(encoding="utf-8").splitlines():
+            stack, _, count = line.rpartition(" ")
+            if stack and count.isdigit():
+                merged[stack] += int(count)
+    return merged
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resume los perfiles guardados por ruta.")
+    parser.add_argument("--dir", type=Path, default=None, help="Directorio de perfiles.")
+    parser.add_argument("--merge-out", type=Path, default=None, help="Escribe un .folded combinado por ruta.")
+    args = parser.parse_args(argv)
+
+    directory = args.dir or get_profile_dir()
+    grouped = load_profiles(directory)
+    if not grouped:
+        print(f"No hay perfiles en {directory}")
+        return 1
+
+    print(f"{'ruta':<40}{'n':>5}{'media ms':>11}{'p50 ms':>10}{'max ms':>10}{'SQL ms':>10}{'SQL n':>8}")
+    for row in summarize(grouped):
+        label = f"{row['method']} {row['route']}"
+        print(
+            f"{label:<40}{row['profiles']:>5}{row['wall_ms_mean']:>11.1f}{row['wall_ms_p50']:>10.1f}"
+            f"{row['wall_ms_max']:>10.1f}{row['sql_ms_mean']:>10.1f}{row['sql_count_mean']:>8.1f}"
+        )
+
+    if args.merge_out:
+        args.merge_out.mkdir(parents=True, exist_ok=True)
+        for (method, route), entries in grouped.items():
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", f"{method} {route}").strip("_")
+            merged = merge_stacks(entries)
+            lines = [f"{stack} {count}" for stack, count in merged.most_common()]
+            (args.merge_out / f"{slug}.folded").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""Generate a large, realistic data set for local performance work.
+
+Usage::
+
+    python -m app.tools.seed --users 200 --proposals-per-user 5000 --seed 7
+
+Users are inserted with one executemany; proposals go through the fastest
+path of the backend: ``COPY ... FROM STDIN`` on PostgreSQL and batched
+``executemany`` inside a single transaction on SQLite. The same seed always
+produces the same rows. Every seeded user can log in with ``SEED_PASSWORD``.
+"""
+
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+
+from .. import fx, lookups, models
+from ..auth_utils import get_password_hash
+from ..database import engine, init_db, is_sharded, shard_engines, shard_for_owner, shard_session
+
+SEED_PASSWORD = "Seed!Pass123"
+
+STATUS_WEIGHTS = {
+    "Enviada": 45,
+    "En negociacion": 10,
+    "Aceptada": 15,
+    "Rechazada": 25,
+    "Borrador": 5,
+}
+PLATFORM_WEIGHTS = {
+    "Workana": 40,
+    "Upwork": 25,
+    "Freelancer": 20,
+    "Fiverr": 10,
+    "LinkedIn": 5,
+}
+# Typical budget (in each currency) used to center the generated amounts.
+CURRENCY_BUDGETS = {
+    "USD": (60, 400.0),
+    "EUR": (10, 350.0),
+    "COP": (15, 1_500_000.0),
+    "MXN": (10, 7_000.0),
+    "BRL": (5, 2_000.0),
+}
+CLIENTS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell", "Soylent", "Cyberdyne"]
+TOPICS = ["API REST", "Dashboard", "Scraper", "Landing page", "ETL", "Chatbot", "App movil", "Migracion AWS"]
+STACKS = ["Python", "FastAPI", "Django", "React", "Node.js", "PostgreSQL", "IA", "Docker"]
+NOTES = [None, None, None, "Cliente con buen historial", "Pide entrega urgente", "Seguimiento en una semana"]
+
+PROPOSAL_COLUMNS = (
+    "client_name",
+    "platform_id",
+    "project_title",
+    "project_link",
+    "amount",
+    "amount_minor",
+    "amount_base_minor",
+    "currency_id",
+    "status_code",
+    "notes",
+    "created_at",
+    "owner_id",
+)
+
+Row = Tuple[object, ...]
+
+
+def _weighted(rng: random.Random, weights: Dict[str, int], count: int) -> List[str]:
+    return rng.choices(list(weights), weights=list(weights.values()), k=count)
+
+
+def generate_proposals(
+    rng: random.Random,
+    owner_ids: Sequence[int],
+    per_user: int,
+    platform_ids: Dict[str, int],
+    currency_ids: Dict[str, int],
+    rates: fx.Rates,
+    base_units: int,
+    days: int,
+    now: datetime,
+) -> Iterator[Row]:
+    """Yield proposal tuples in ``PROPOSAL_COLUMNS`` order."""
+    currency_weights = {code: weight for code, (weight, _) in CURRENCY_BUDGETS.items()}
+    for owner_id in owner_ids:
+        statuses = _weighted(rng, STATUS_WEIGHTS, per_user)
+        platforms = _weighted(rng, PLATFORM_WEIGHTS, per_user)
+        currencies = _weighted(rng, currency_weights, per_user)
+        for idx in range(per_user):
+            currency = currencies[idx]
+            rate, minor_units = rates.get(currency, (None, fx.DEFAULT_MINOR_UNITS))
+            budget = CURRENCY_BUDGETS[currency][1]
+            amount = round(budget * rng.lognormvariate(0, 0.8), minor_units)
+            amount_minor = fx.to_minor(amount, 10**minor_units)
+            amount_base_minor = fx.to_minor(amount, rate * 10**base_units) if rate else None
+            title = f"{rng.choice(TOPICS)} en {rng.choice(STACKS)}"
+            link = f"https://example.com/jobs/{owner_id}-{idx}" if rng.random() < 0.7 else None
+            created_at = now - timedelta(seconds=rng.randrange(days * 86400))
+            yield (
+                rng.choice(CLIENTS),
+                platform_ids[platforms[idx]],
+                title,
+                link,
+                amount,
+                amount_minor,
+                amount_base_minor,
+                currency_ids[currency],
+                models.PROPOSAL_STATUS_CODES[statuses[idx]],
+                rng.choice(NOTES),
+                created_at,
+                owner_id,
+            )
+
+
+def _batches(rows: Iterator[Row], size: int) -> Iterator[List[Row]]:
+    batch: List[Row] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _load_postgres(target: Engine, rows: Iterator[Row], batch_size: int) -> int:
+    copy_sql = f"COPY proposals ({', '.join(PROPOSAL_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    total = 0
+    raw = target.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for batch in _batches(rows, batch_size):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in batch:
+                # Empty unquoted fields are NULL in CSV COPY.
+                writer.writerow(
+                    "" if value is None else value.isoformat() if isinstance(value, datetime) else value
+                    for value in row
+                )
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+            total += len(batch)
+        raw.commit()
+    finally:
+        raw.close()
+    return total
+
+
+def _load_sqlite(target: Engine, rows: Iterator[Row], batch_size: int) -> int:
+    placeholders = ", ".join("?" for _ in PROPOSAL_COLUMNS)
+    insert_sql = f"INSERT INTO proposals ({', '.join(PROPOSAL_COLUMNS)}) VALUES ({placeholders})"
+    created_at_idx = PROPOSAL_COLUMNS.index("created_at")
+    total = 0
+    raw = target.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for batch in _batches(rows, batch_size):
+            # Store datetimes the way SQLAlchemy's SQLite DateTime type does.
+            cursor.executemany(
+                insert_sql,
+                [
+                    row[:created_at_idx]
+                    + (row[created_at_idx].strftime("%Y-%m-%d %H:%M:%S.%f"),)
+                    + row[created_at_idx + 1 :]
+                    for row in batch
+                ],
+            )
+            total += len(batch)
+        raw.commit()
+    finally:
+        raw.close()
+    return total
+
+
+def seed(
+    users: int,
+    proposals_per_user: int,
+    seed_value: int = 0,
+    batch_size: int = 10_000,
+    days: int = 3 * 365,
+) -> Dict[str, float]:
+    """Insert ``users`` users with ``proposals_per_user`` proposals each."""
+    rng = random.Random(seed_value)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    init_db()
+    fx.sync_fx_rates()
+
+    emails = [f"seed{seed_value}-{idx}@example.com" for idx in range(users)]
+    hashed_password = get_password_hash(SEED_PASSWORD)
+    # With SQLite sharding the ids are allocated by the directory database.
+    id_table = models.UserDirectory if is_sharded() else models.User
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(id_table.__table__),
+            [
+                {"email": email} if is_sharded() else {"email": email, "hashed_password": hashed_password}
+                for email in emails
+            ],
+        )
+        email_by_id = dict(
+            conn.execute(select(id_table.id, id_table.email).where(id_table.email.in_(emails))).all()
+        )
+    owner_ids = sorted(email_by_id)
+
+    targets = shard_engines()
+    owners_by_shard: Dict[Optional[int], List[int]] = {shard: [] for shard in targets}
+    for owner_id in owner_ids:
+        shard = shard_for_owner(owner_id, len(targets)) if is_sharded() else None
+        owners_by_shard[shard].append(owner_id)
+
+    inserted = 0
+    for shard, target in targets.items():
+        shard_owner_ids = owners_by_shard[shard]
+        if not shard_owner_ids:
+            continue
+        if is_sharded():
+            with target.begin() as conn:
+                conn.execute(
+                    insert(models.User.__table__),
+                    [
+                        {"id": owner_id, "email": email_by_id[owner_id], "hashed_password": hashed_password}
+                        for owner_id in shard_owner_ids
+                    ],
+                )
+
+        db = shard_session(shard)
+        try:
+            platform_ids = {name: lookups.intern_platform(db, name).id for name in PLATFORM_WEIGHTS}
+            currency_ids = {code: lookups.intern_currency(db, code).id for code in CURRENCY_BUDGETS}
+            rates: fx.Rates = {row.currency: (row.rate, row.minor_units) for row in db.query(models.FxRate)}
+            db.commit()
+        finally:
+            db.close()
+        base_units = rates.get(fx.get_base_currency(), (1.0, fx.DEFAULT_MINOR_UNITS))[1]
+
+        rows = generate_proposals(
+            rng, shard_owner_ids, proposals_per_user, platform_ids, currency_ids, rates, base_units, days, now
+        )
+        if target.dialect.name == "postgresql":
+            inserted += _load_postgres(target, rows, batch_size)
+        else:
+            inserted += _load_sqlite(target, rows, batch_size)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "users": len(owner_ids),
+        "proposals": inserted,
+        "seconds": elapsed,
+        "rows_per_second": (len(owner_ids) + inserted) / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Carga datos sinteticos en la base configurada.")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--proposals-per-user", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=3 * 365, help="Rango de fechas de creacion hacia atras.")
+    args = parser.parse_args(argv)
+
+    result = seed(args.users, args.proposals_per_user, args.seed, args.batch_size, args.days)
+    print(
+        f"{result['users']} usuarios y {result['proposals']} propuestas en "
+        f"{result['seconds']:.2f}s ({result['rows_per_second']:,.0f} filas/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
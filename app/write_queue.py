@@ -0,0 +1,172 @@
+"""Group commit for proposal inserts.
+
+When enabled, ``create_proposal`` hands its validated payload to a single
+writer thread instead of committing on its own. The writer gathers whatever
+arrives within a few milliseconds (or up to a batch limit) and inserts it in
+one transaction, so a burst of creates costs one fsync / round trip instead of
+one per proposal. Each caller blocks until the transaction holding its row has
+committed and then receives its own row, or its own exception.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from . import fx, lookups, models
+from .config import get_write_batch_max_delay_ms, get_write_batch_size, should_coalesce_writes
+from .database import SessionLocal, ShardedSession, route_to_owner, shard_for_owner
+
+logger = logging.getLogger("freelatracker.write_queue")
+
+SUBMIT_TIMEOUT_SECONDS = 30.0
+
+_Item = Tuple[dict, int, Future]
+
+
+class ProposalWriteQueue:
+    def __init__(self, session_factory: sessionmaker, max_batch: int = 64, max_delay_ms: float = 5.0):
+        self._session_factory = session_factory
+        self._max_batch = max(max_batch, 1)
+        self._max_delay = max(max_delay_ms, 0.0) / 1000.0
+        self._queue: "queue.Queue[Optional[_Item]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._accepting = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="proposal-writer", daemon=True)
+        self._thread.start()
+        self._accepting = True
+
+    def stop(self) -> None:
+        """Flush everything already queued, then stop the writer."""
+        if self._thread is None:
+            return
+        # Nothing may be queued behind the sentinel: it would never be flushed.
+        with self._lock:
+            self._accepting = False
+            self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, payload: dict, owner_id: int) -> models.Proposal:
+        """Queue a proposal insert and wait until it is committed."""
+        future: Future = Future()
+        with self._lock:
+            if not self._accepting:
+                raise RuntimeError("La cola de escritura no esta iniciada.")
+            self._queue.put((payload, owner_id, future))
+        try:
+            return future.result(timeout=SUBMIT_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            # Still queued: cancel it so the writer skips it. Already picked up:
+            # its commit is in flight, so wait for the real outcome.
+            if future.cancel():
+                raise
+            return future.result()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch: List[_Item] = [first]
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._flush(batch)
+            except Exception as exc:
+                logger.exception("Proposal writer failed to flush %d items", len(batch))
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _flush(self, batch: List[_Item]) -> None:
+        # Owners on different SQLite shards cannot share a transaction.
+        session_class = self._session_factory.class_
+        by_shard: Dict[Optional[int], List[_Item]] = defaultdict(list)
+        for item in batch:
+            shard = None
+            if issubclass(session_class, ShardedSession):
+                shard = shard_for_owner(item[1], len(session_class.shard_engines))
+            by_shard[shard].append(item)
+        for items in by_shard.values():
+            try:
+                self._write(items)
+            except Exception:
+                logger.warning("Group commit of %d proposals failed; retrying one by one", len(items))
+                for item in items:
+                    if not item[2].done():
+                        self._write([item])
+
+    def _write(self, items: List[_Item]) -> None:
+        db: Session = self._session_factory()
+        try:
+            route_to_owner(db, items[0][1])
+            pending = []
+            for payload, owner_id, future in items:
+                # A retry after a failed batch finds the future already running.
+                if not future.running() and not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    proposal = models.Proposal(owner_id=owner_id)
+                    lookups.apply_proposal_fields(db, proposal, payload)
+                    fx.apply_amounts(db, proposal)
+                except Exception as exc:
+                    future.set_exception(exc)
+                    continue
+                db.add(proposal)
+                pending.append((proposal, future))
+            try:
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                if len(items) == 1:
+                    items[0][2].set_exception(exc)
+                    return
+                raise
+            for proposal, future in pending:
+                future.set_result(proposal)
+        finally:
+            db.close()
+
+
+_write_queue: Optional[ProposalWriteQueue] = None
+
+
+def get_write_queue() -> Optional[ProposalWriteQueue]:
+    return _write_queue
+
+
+def start_write_queue() -> None:
+    global _write_queue
+    if not should_coalesce_writes() or _write_queue is not None:
+        return
+    _write_queue = ProposalWriteQueue(SessionLocal, get_write_batch_size(), get_write_batch_max_delay_ms())
+    _write_queue.start()
+
+
+def stop_write_queue() -> None:
+    global _write_queue
+    if _write_queue is None:
+        return
+    _write_queue.stop()
+    _write_queue = None
@@ -0,0 +1,31 @@
+-- Integer minor-unit amounts, base-currency amounts and the local fx_rates table.
+-- After applying, run `python -m app.fx` to load app/data/fx_rates.csv and
+-- fill amount_base_minor for existing proposals.
+
+-- PostgreSQL compatible version:
+ALTER TABLE proposals ADD COLUMN IF NOT EXISTS amount_minor BIGINT;
+ALTER TABLE proposals ADD COLUMN IF NOT EXISTS amount_base_minor BIGINT;
+UPDATE proposals SET amount_minor = CAST(ROUND(CAST(amount AS NUMERIC) * 100) AS BIGINT)
+WHERE amount_minor IS NULL;
+
+CREATE TABLE IF NOT EXISTS fx_rates (
+    currency VARCHAR(10) PRIMARY KEY,
+    rate DOUBLE PRECISION NOT NULL,
+    minor_units INTEGER NOT NULL DEFAULT 2,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_proposals_owner_status_base
+    ON proposals (owner_id, status, amount_base_minor);
+
+-- SQLite fallback:
+-- ALTER TABLE proposals ADD COLUMN amount_minor INTEGER;
+-- ALTER TABLE proposals ADD COLUMN amount_base_minor INTEGER;
+-- UPDATE proposals SET amount_minor = CAST(ROUND(amount * 100) AS INTEGER) WHERE amount_minor IS NULL;
+-- CREATE TABLE IF NOT EXISTS fx_rates (
+--     currency TEXT PRIMARY KEY,
+--     rate REAL NOT NULL,
+--     minor_units INTEGER NOT NULL DEFAULT 2,
+--     updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+-- );
+-- CREATE INDEX IF NOT EXISTS ix_proposals_owner_status_base
+--     ON proposals (owner_id, status, amount_base_minor);
@@ -0,0 +1,80 @@
+-- Replace repeated strings on proposals with small codes and lookup ids.
+-- status -> status_code (see PROPOSAL_STATUS_CODES in app/models.py),
+-- platform -> platforms.id, currency -> currencies.id.
+-- Run inside a transaction and re-run `python -m app.fx` afterwards.
+
+-- PostgreSQL compatible version:
+CREATE TABLE IF NOT EXISTS platforms (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(80) NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS currencies (
+    id SERIAL PRIMARY KEY,
+    code VARCHAR(10) NOT NULL UNIQUE
+);
+
+INSERT INTO platforms (name)
+SELECT DISTINCT platform FROM proposals
+ON CONFLICT (name) DO NOTHING;
+INSERT INTO currencies (code)
+SELECT DISTINCT COALESCE(currency, 'USD') FROM proposals
+ON CONFLICT (code) DO NOTHING;
+
+ALTER TABLE proposals ADD COLUMN IF NOT EXISTS platform_id INTEGER REFERENCES platforms (id);
+ALTER TABLE proposals ADD COLUMN IF NOT EXISTS currency_id INTEGER REFERENCES currencies (id);
+ALTER TABLE proposals ADD COLUMN IF NOT EXISTS status_code SMALLINT;
+
+UPDATE proposals p SET
+    platform_id = pl.id,
+    currency_id = c.id,
+    status_code = CASE p.status
+        WHEN 'Enviada' THEN 1
+        WHEN 'En negociacion' THEN 2
+        WHEN 'Aceptada' THEN 3
+        WHEN 'Rechazada' THEN 4
+        WHEN 'Borrador' THEN 5
+        ELSE 1
+    END
+FROM platforms pl, currencies c
+WHERE pl.name = p.platform AND c.code = COALESCE(p.currency, 'USD');
+
+ALTER TABLE proposals ALTER COLUMN platform_id SET NOT NULL;
+ALTER TABLE proposals ALTER COLUMN currency_id SET NOT NULL;
+ALTER TABLE proposals ALTER COLUMN status_code SET NOT NULL;
+ALTER TABLE proposals ALTER COLUMN status_code SET DEFAULT 1;
+
+DROP INDEX IF EXISTS ix_proposals_status;
+DROP INDEX IF EXISTS ix_proposals_owner_status;
+DROP INDEX IF EXISTS ix_proposals_owner_status_base;
+ALTER TABLE proposals DROP COLUMN IF EXISTS status;
+ALTER TABLE proposals DROP COLUMN IF EXISTS platform;
+ALTER TABLE proposals DROP COLUMN IF EXISTS currency;
+CREATE INDEX IF NOT EXISTS ix_proposals_owner_status_base
+    ON proposals (owner_id, status_code, amount_base_minor);
+
+-- Reclaim the space of the dropped columns (cannot run inside a transaction):
+-- VACUUM FULL proposals;
+
+-- SQLite fallback (requires SQLite >= 3.35 for DROP COLUMN):
+-- CREATE TABLE IF NOT EXISTS platforms (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+-- CREATE TABLE IF NOT EXISTS currencies (id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE);
+-- INSERT OR IGNORE INTO platforms (name) SELECT DISTINCT platform FROM proposals;
+-- INSERT OR IGNORE INTO currencies (code) SELECT DISTINCT COALESCE(currency, 'USD') FROM proposals;
+-- ALTER TABLE proposals ADD COLUMN platform_id INTEGER REFERENCES platforms (id);
+-- ALTER TABLE proposals ADD COLUMN currency_id INTEGER REFERENCES currencies (id);
+-- ALTER TABLE proposals ADD COLUMN status_code INTEGER NOT NULL DEFAULT 1;
+-- UPDATE proposals SET
+--     platform_id = (SELECT id FROM platforms WHERE name = proposals.platform),
+--     currency_id = (SELECT id FROM currencies WHERE code = COALESCE(proposals.currency, 'USD')),
+--     status_code = CASE status
+--         WHEN 'Enviada' THEN 1 WHEN 'En negociacion' THEN 2 WHEN 'Aceptada' THEN 3
+--         WHEN 'Rechazada' THEN 4 WHEN 'Borrador' THEN 5 ELSE 1 END;
+-- DROP INDEX IF EXISTS ix_proposals_status;
+-- DROP INDEX IF EXISTS ix_proposals_owner_status;
+-- DROP INDEX IF EXISTS ix_proposals_owner_status_base;
+-- ALTER TABLE proposals DROP COLUMN status;
+-- ALTER TABLE proposals DROP COLUMN platform;
+-- ALTER TABLE proposals DROP COLUMN currency;
+-- CREATE INDEX IF NOT EXISTS ix_proposals_owner_status_base
+--     ON proposals (owner_id, status_code, amount_base_minor);
+-- VACUUM;
@@ -0,0 +1,30 @@
+-- Stored responses for Idempotency-Key retries on the proposal write routes.
+-- Rows expire after FREELATRACKER_IDEMPOTENCY_TTL_HOURS and are purged at startup.
+
+-- PostgreSQL compatible version:
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id SERIAL PRIMARY KEY,
+    owner_id INTEGER NOT NULL REFERENCES users (id),
+    key VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    status_code SMALLINT NOT NULL,
+    response_body BYTEA,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMPTZ NOT NULL,
+    CONSTRAINT uq_idempotency_keys_owner_key UNIQUE (owner_id, key)
+);
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at ON idempotency_keys (expires_at);
+
+-- SQLite fallback:
+-- CREATE TABLE IF NOT EXISTS idempotency_keys (
+--     id INTEGER PRIMARY KEY,
+--     owner_id INTEGER NOT NULL REFERENCES users (id),
+--     key TEXT NOT NULL,
+--     fingerprint TEXT NOT NULL,
+--     status_code INTEGER NOT NULL,
+--     response_body BLOB,
+--     created_at TEXT NOT NULL DEFAULT (datetime('now')),
+--     expires_at TEXT NOT NULL,
+--     CONSTRAINT uq_idempotency_keys_owner_key UNIQUE (owner_id, key)
+-- );
+-- CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at ON idempotency_keys (expires_at);
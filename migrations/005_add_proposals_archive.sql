@@ -0,0 +1,63 @@
+-- Cold storage for closed proposals and per-owner rollups of what was moved.
+-- Plain tables rather than PostgreSQL partitioning, so the same schema and
+-- archival job work on SQLite. Rows are moved by `python -m app.archive`
+-- (or the in-process scheduler); nothing is moved by this migration.
+
+-- PostgreSQL compatible version:
+CREATE TABLE IF NOT EXISTS proposals_archive (
+    id INTEGER PRIMARY KEY,
+    client_name VARCHAR(120) NOT NULL,
+    platform_id INTEGER NOT NULL REFERENCES platforms (id),
+    project_title VARCHAR(180) NOT NULL,
+    project_link VARCHAR(500),
+    amount DOUBLE PRECISION NOT NULL,
+    amount_minor BIGINT,
+    amount_base_minor BIGINT,
+    currency_id INTEGER NOT NULL REFERENCES currencies (id),
+    status_code SMALLINT NOT NULL,
+    notes VARCHAR(500),
+    created_at TIMESTAMPTZ,
+    owner_id INTEGER NOT NULL REFERENCES users (id),
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_proposals_archive_owner_created
+    ON proposals_archive (owner_id, created_at);
+
+CREATE TABLE IF NOT EXISTS proposal_rollups (
+    owner_id INTEGER NOT NULL REFERENCES users (id),
+    status_code SMALLINT NOT NULL,
+    currency_id INTEGER NOT NULL REFERENCES currencies (id),
+    proposal_count INTEGER NOT NULL DEFAULT 0,
+    amount_total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (owner_id, status_code, currency_id)
+);
+
+-- SQLite fallback:
+-- CREATE TABLE IF NOT EXISTS proposals_archive (
+--     id INTEGER PRIMARY KEY,
+--     client_name TEXT NOT NULL,
+--     platform_id INTEGER NOT NULL REFERENCES platforms (id),
+--     project_title TEXT NOT NULL,
+--     project_link TEXT,
+--     amount REAL NOT NULL,
+--     amount_minor INTEGER,
+--     amount_base_minor INTEGER,
+--     currency_id INTEGER NOT NULL REFERENCES currencies (id),
+--     status_code INTEGER NOT NULL,
+--     notes TEXT,
+--     created_at TEXT,
+--     owner_id INTEGER NOT NULL REFERENCES users (id),
+--     archived_at TEXT NOT NULL DEFAULT (datetime('now'))
+-- );
+-- CREATE INDEX IF NOT EXISTS ix_proposals_archive_owner_created
+--     ON proposals_archive (owner_id, created_at);
+-- CREATE TABLE IF NOT EXISTS proposal_rollups (
+--     owner_id INTEGER NOT NULL REFERENCES users (id),
+--     status_code INTEGER NOT NULL,
+--     currency_id INTEGER NOT NULL REFERENCES currencies (id),
+--     proposal_count INTEGER NOT NULL DEFAULT 0,
+--     amount_total REAL NOT NULL DEFAULT 0,
+--     updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+--     PRIMARY KEY (owner_id, status_code, currency_id)
+-- );
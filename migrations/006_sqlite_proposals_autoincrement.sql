@@ -0,0 +1,58 @@
+-- Never reuse proposal ids once their rows move to proposals_archive.
+-- Without AUTOINCREMENT SQLite hands out max(id) + 1, so archiving the newest
+-- closed proposals frees their ids for new rows and the next archival run fails
+-- on proposals_archive's primary key.
+
+-- PostgreSQL compatible version:
+-- Nothing to do: SERIAL sequences never hand out an id twice.
+
+-- SQLite fallback:
+-- Run on every database file (each shard when FREELATRACKER_SQLITE_SHARDS > 1),
+-- with the app stopped. If archival already failed with
+-- "UNIQUE constraint failed: proposals_archive.id", first list the clashing ids:
+--   SELECT id FROM proposals WHERE id IN (SELECT id FROM proposals_archive);
+-- PRAGMA foreign_keys = OFF;
+-- BEGIN;
+--
+-- CREATE TABLE proposals_new (
+--     id INTEGER PRIMARY KEY AUTOINCREMENT,
+--     client_name VARCHAR(120) NOT NULL,
+--     platform_id INTEGER NOT NULL REFERENCES platforms (id),
+--     project_title VARCHAR(180) NOT NULL,
+--     project_link VARCHAR(500),
+--     amount FLOAT NOT NULL,
+--     amount_minor BIGINT,
+--     amount_base_minor BIGINT,
+--     currency_id INTEGER NOT NULL REFERENCES currencies (id),
+--     status_code SMALLINT NOT NULL,
+--     notes VARCHAR(500),
+--     created_at DATETIME,
+--     owner_id INTEGER NOT NULL REFERENCES users (id)
+-- );
+-- INSERT INTO proposals_new (
+--     id, client_name, platform_id, project_title, project_link, amount, amount_minor,
+--     amount_base_minor, currency_id, status_code, notes, created_at, owner_id
+-- )
+-- SELECT
+--     id, client_name, platform_id, project_title, project_link, amount, amount_minor,
+--     amount_base_minor, currency_id, status_code, notes, created_at, owner_id
+-- FROM proposals;
+-- DROP TABLE proposals;
+-- ALTER TABLE proposals_new RENAME TO proposals;
+--
+-- CREATE INDEX ix_proposals_id ON proposals (id);
+-- CREATE INDEX ix_proposals_owner_id ON proposals (owner_id);
+-- CREATE INDEX ix_proposals_created_at ON proposals (created_at);
+-- CREATE INDEX ix_proposals_owner_created ON proposals (owner_id, created_at);
+-- CREATE INDEX ix_proposals_owner_status_base ON proposals (owner_id, status_code, amount_base_minor);
+--
+-- -- Start the sequence above every id ever used, archived ones included.
+-- DELETE FROM sqlite_sequence WHERE name = 'proposals';
+-- INSERT INTO sqlite_sequence (name, seq)
+-- SELECT 'proposals', MAX(
+--     (SELECT COALESCE(MAX(id), 0) FROM proposals),
+--     (SELECT COALESCE(MAX(id), 0) FROM proposals_archive)
+-- );
+--
+-- COMMIT;
+-- PRAGMA foreign_keys = ON;
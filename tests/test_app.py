@@ -1,10 +1,21 @@
+import json
+import logging
 import os
+import queue
+import random
 import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -14,9 +25,13 @@ if str(ROOT) not in sys.path:
 os.environ["FREELATRACKER_SECRET_KEY"] = "tests_secret_key_with_32_chars_minimum!"
 os.environ["FREELATRACKER_DATABASE_URL"] = "sqlite:///./freelatracker_test.db"
 
+from app import archive, config, directory, fx, idempotency, logging_setup, models, profiling, write_queue  # noqa: E402
+from app import database as database_module  # noqa: E402
 from app.database import Base, SessionLocal, engine, get_db  # noqa: E402
 from app.main import app  # noqa: E402
 from app.routers import auth as auth_router  # noqa: E402
+from app.tools import profiles as profiles_tool  # noqa: E402
+from app.tools import seed as seed_tool  # noqa: E402
 
 
 def override_get_db():
@@ -34,6 +49,7 @@ app.dependency_overrides[get_db] = override_get_db
 def clean_db():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    idempotency.response_cache.clear()
     yield
     Base.metadata.drop_all(bind=engine)
     auth_router._login_attempts.clear()
@@ -176,3 +192,498 @@ def test_login_rate_limit_blocks_after_threshold(client: TestClient):
         headers={"Content-Type": "application/x-www-form-urlencoded"},
     )
     assert blocked.status_code == 429
+
+
+def test_dashboard_bootstrap_returns_user_proposals_and_stats(client: TestClient):
+    email = "bootstrap@example.com"
+    password = "Strong!Pass123"
+    _register_user(client, email=email, password=password)
+    token = _login(client, email, password)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    empty = client.get("/dashboard/bootstrap", headers=headers)
+    assert empty.status_code == 200, empty.text
+    assert empty.json()["proposals"] == []
+    assert empty.json()["stats"]["total"] == 0
+
+    for idx, status_value in enumerate(["Aceptada", "Rechazada", "Enviada"]):
+        body = {"client_name": f"C{idx}", "platform": "Workana", "project_title": f"P{idx}", "amount": 10, "status": status_value}
+        assert client.post("/proposals/", json=body, headers=headers).status_code == 200
+
+    res = client.get("/dashboard/bootstrap", params={"limit": 2}, headers=headers)
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert data["user"]["email"] == email
+    assert len(data["proposals"]) == 2
+    assert data["stats"] == client.get("/proposals/stats/basic", headers=headers).json()
+    assert data["stats"]["total"] == 3
+
+
+def test_revenue_stats_normalize_currencies_and_follow_rate_reloads(client: TestClient):
+    email = "revenue@example.com"
+    password = "Strong!Pass123"
+    _register_user(client, email=email, password=password)
+    token = _login(client, email, password)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    payloads = [
+        {"client_name": "A", "platform": "Workana", "project_title": "P1", "amount": 100, "currency": "USD", "status": "Aceptada"},
+        {"client_name": "B", "platform": "Upwork", "project_title": "P2", "amount": 100, "currency": "eur", "status": "Aceptada"},
+        {"client_name": "C", "platform": "Workana", "project_title": "P3", "amount": 4000000, "currency": "COP", "status": "Enviada"},
+        {"client_name": "D", "platform": "Workana", "project_title": "P4", "amount": 5, "currency": "XYZ", "status": "Enviada"},
+    ]
+    for body in payloads:
+        assert client.post("/proposals/", json=body, headers=headers).status_code == 200
+
+    stats = client.get("/proposals/stats/revenue", headers=headers).json()
+    assert stats == {"base_currency": "USD", "won": 208.0, "pipeline": 1000.0, "unconverted": 1}
+
+    rates = fx.read_rates_file(fx.get_fx_rates_file())
+    rates["EUR"] = (1.5, 2)
+    db = SessionLocal()
+    try:
+        assert fx.reload_fx_rates(db, rates) == 1
+    finally:
+        db.close()
+
+    stats = client.get("/proposals/stats/revenue", headers=headers).json()
+    assert stats["won"] == 250.0
+
+
+def test_half_amounts_round_the_same_on_create_and_rate_reload(client: TestClient):
+    email = "rounding@example.com"
+    password = "Strong!Pass123"
+    _register_user(client, email=email, password=password)
+    token = _login(client, email, password)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    body = {"client_name": "A", "platform": "Workana", "project_title": "P", "amount": 2.5, "currency": "JPY", "status": "Aceptada"}
+    proposal_id = client.post("/proposals/", json=body, headers=headers).json()["id"]
+
+    def minor_amounts():
+        db = SessionLocal()
+        try:
+            proposal = db.get(models.Proposal, proposal_id)
+            return proposal.amount_minor, proposal.amount_base_minor
+        finally:
+            db.close()
+
+    created = minor_amounts()
+    assert created[0] == 3
+
+    rates = fx.read_rates_file(fx.get_fx_rates_file())
+    db = SessionLocal()
+    try:
+        assert fx.reload_fx_rates(db, {**rates, "JPY": (0.0068, 0)}) == 1
+        assert fx.reload_fx_rates(db, rates) == 1
+    finally:
+        db.close()
+    assert minor_amounts() == created
+
+
+def test_platform_and_currency_are_interned_but_exposed_as_strings(client: TestClient):
+    email = "lookups@example.com"
+    password = "Strong!Pass123"
+    _register_user(client, email=email, password=password)
+    token = _login(client, email, password)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    body = {"client_name": "A", "platform": "Workana", "project_title": "P1", "amount": 10, "currency": "USD"}
+    first = client.post("/proposals/", json=body, headers=headers).json()
+    second = client.post("/proposals/", json={**body, "status": "En negociacion"}, headers=headers).json()
+    assert second["platform"] == "Workana"
+    assert second["status"] == "En negociacion"
+
+    updated = client.put(f"/proposals/{first['id']}", json={"platform": "Upwork", "currency": "EUR"}, headers=headers)
+    assert updated.status_code == 200, updated.text
+    assert updated.json()["platform"] == "Upwork"
+    assert updated.json()["currency"] == "EUR"
+    assert updated.json()["status"] == "Enviada"
+
+    db = SessionLocal()
+    try:
+        assert db.query(models.Platform).count() == 2
+        assert db.query(models.Currency).count() == 2
+    finally:
+        db.close()
+
+
+def test_seed_tool_loads_proposals_that_the_api_can_read(client: TestClient):
+    result = seed_tool.seed(users=2, proposals_per_user=50, seed_value=3, batch_size=16)
+    assert result["users"] == 2
+    assert result["proposals"] == 100
+
+    token = _login(client, "seed3-0@example.com", seed_tool.SEED_PASSWORD)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    proposals = client.get("/proposals/", headers=headers).json()
+    assert len(proposals) == 50
+    assert {p["platform"] for p in proposals} <= set(seed_tool.PLATFORM_WEIGHTS)
+    assert client.get("/proposals/stats/basic", headers=headers).json()["total"] == 50
+
+
+def test_seed_tool_is_deterministic_by_seed():
+    platform_ids = {name: 1 for name in seed_tool.PLATFORM_WEIGHTS}
+    currency_ids = {code: 1 for code in seed_tool.CURRENCY_BUDGETS}
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def generate(seed_value: int):
+        rng = random.Random(seed_value)
+        return list(seed_tool.generate_proposals(rng, [1, 2], 10, platform_ids, currency_ids, {}, 2, 30, now))
+
+    assert generate(5) == generate(5)
+    assert generate(5) != generate(6)
+
+
+def test_sharded_sessions_route_users_to_their_shard(tmp_path):
+    directory_engine = database_module._build_engine(f"sqlite:///{tmp_path / 'dir.db'}")
+    urls = database_module.shard_urls(f"sqlite:///{tmp_path / 'dir.db'}", 3)
+    ShardedLocal = database_module.build_sharded_sessionmaker(directory_engine, urls)
+    database_module.DirectoryBase.metadata.create_all(bind=directory_engine)
+    for shard_engine in ShardedLocal.class_.shard_engines:
+        Base.metadata.create_all(bind=shard_engine)
+
+    db = ShardedLocal()
+    try:
+        users = [directory.add_user(db, f"shard{idx}@example.com", "hash") for idx in range(6)]
+        for user in users:
+            found = directory.find_user_by_email(db, user.email)
+            assert found is not None and found.id == user.id
+            assert db.info["shard"] == database_module.shard_for_owner(user.id, 3)
+        assert directory.find_user_by_email(db, "missing@example.com") is None
+    finally:
+        db.close()
+
+    per_shard = []
+    for shard_engine in ShardedLocal.class_.shard_engines:
+        with shard_engine.connect() as conn:
+            per_shard.append(conn.execute(models.User.__table__.select()).fetchall())
+        shard_engine.dispose()
+    directory_engine.dispose()
+    assert sum(len(rows) for rows in per_shard) == 6
+    assert len([rows for rows in per_shard if rows]) > 1
+
+
+def test_write_queue_group_commits_and_isolates_failures(client: TestClient):
+    _register_user(client, email="queue@example.com")
+    db = SessionLocal()
+    owner_id = db.query(models.User).one().id
+    db.close()
+
+    writer = write_queue.ProposalWriteQueue(SessionLocal, max_batch=8, max_delay_ms=20)
+    writer.start()
+    try:
+        def submit(idx: int):
+            payload = {"client_name": f"C{idx}", "platform": "Workana", "project_title": "P", "amount": 10.0, "currency": "USD", "status": "Enviada"}
+            if idx == 3:
+                payload["client_name"] = None  # NOT NULL violation inside the batch
+            return writer.submit(payload, owner_id)
+
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            futures = [pool.submit(submit, idx) for idx in range(12)]
+        outcomes = [future.exception() or future.result() for future in futures]
+    finally:
+        writer.stop()
+
+    failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    created = [outcome for outcome in outcomes if not isinstance(outcome, Exception)]
+    assert len(failures) == 1
+    assert len({proposal.id for proposal in created}) == 11
+    assert all(proposal.platform == "Workana" for proposal in created)
+
+    db = SessionLocal()
+    try:
+        assert db.query(models.Proposal).count() == 11
+    finally:
+        db.close()
+
+
+def test_write_queue_skips_cancelled_items_and_rejects_submits_after_stop(client: TestClient):
+    _register_user(client, email="cancel@example.com")
+    db = SessionLocal()
+    owner_id = db.query(models.User).one().id
+    db.close()
+
+    writer = write_queue.ProposalWriteQueue(SessionLocal)
+    payload = {"client_name": "C", "platform": "Workana", "project_title": "P", "amount": 10.0, "currency": "USD", "status": "Enviada"}
+    cancelled: Future = Future()
+    cancelled.cancel()
+    kept: Future = Future()
+    writer._write([(payload, owner_id, cancelled), (payload, owner_id, kept)])
+    assert kept.result().id is not None
+
+    writer.start()
+    writer.stop()
+    with pytest.raises(RuntimeError):
+        writer.submit(payload, owner_id)
+
+    db = SessionLocal()
+    try:
+        assert db.query(models.Proposal).count() == 1
+    finally:
+        db.close()
+
+
+def test_fields_parameter_trims_list_and_detail_responses(client: TestClient):
+    email = "fields@example.com"
+    password = "Strong!Pass123"
+    _register_user(client, email=email, password=password)
+    token = _login(client, email, password)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    body = {"client_name": "A", "platform": "Workana", "project_title": "P1", "project_link": "https://example.com/p", "amount": 10, "currency": "EUR", "status": "Aceptada", "notes": "larga"}
+    proposal_id = client.post("/proposals/", json=body, headers=headers).json()["id"]
+
+    res = client.get("/proposals/", params={"fields": "client_name,status,amount,currency"}, headers=headers)
+    assert res.status_code == 200, res.text
+    assert res.json() == [{"id": proposal_id, "client_name": "A", "status": "Aceptada", "amount": 10.0, "currency": "EUR"}]
+
+    detail = client.get(f"/proposals/{proposal_id}", params={"fields": "project_title,project_link"}, headers=headers)
+    assert detail.json() == {"id": proposal_id, "project_title": "P1", "project_link": "https://example.com/p"}
+
+    assert client.get("/proposals/", params={"fields": "hashed_password"}, headers=headers).status_code == 400
+    assert client.get(f"/proposals/{proposal_id}", headers=headers).json()["notes"] == "larga"
+
+
+def test_idempotency_key_replays_writes_without_repeating_them(client: TestClient):
+    email = "retry@example.com"
+    password = "Strong!Pass123"
+    _register_user(client, email=email, password=password)
+    token = _login(client, email, password)["access_token"]
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "create-1"}
+    body = {"client_name": "A", "platform": "Workana", "project_title": "P", "amount": 10, "currency": "USD", "status": "Enviada"}
+
+    # An expired record is swept by the first keyed write.
+    db = SessionLocal()
+    try:
+        owner_id = db.query(models.User).one().id
+        expired_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.add(models.IdempotencyRecord(owner_id=owner_id, key="stale", fingerprint="x", status_code=200, expires_at=expired_at))
+        db.commit()
+    finally:
+        db.close()
+    idempotency._last_purge.clear()
+
+    first = client.post("/proposals/", json=body, headers=headers)
+    assert first.status_code == 200, first.text
+    assert "Idempotent-Replayed" not in first.headers
+    replay = client.post("/proposals/", json=body, headers=headers)
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+
+    # Another worker has an empty cache and answers from the table.
+    idempotency.response_cache.clear()
+    assert client.post("/proposals/", json=body, headers=headers).json() == first.json()
+    assert client.post("/proposals/", json={**body, "amount": 99}, headers=headers).status_code == 422
+
+    proposal_id = first.json()["id"]
+    update_headers = {**headers, "Idempotency-Key": "update-1"}
+    for _ in range(2):
+        res = client.put(f"/proposals/{proposal_id}", json={"status": "Aceptada"}, headers=update_headers)
+        assert res.json()["status"] == "Aceptada"
+
+    delete_headers = {**headers, "Idempotency-Key": "delete-1"}
+    assert client.delete(f"/proposals/{proposal_id}", headers=delete_headers).status_code == 204
+    again = client.delete(f"/proposals/{proposal_id}", headers=delete_headers)
+    assert again.status_code == 204
+    assert again.headers["Idempotent-Replayed"] == "true"
+
+    db = SessionLocal()
+    try:
+        assert db.query(models.Proposal).count() == 0
+        assert db.query(models.IdempotencyRecord).count() == 3
+    finally:
+        db.close()
+
+
+def test_archival_moves_old_closed_proposals_and_keeps_all_time_stats(client: TestClient):
+    email = "archive@example.com"
+    password = "Strong!Pass123"
+    _register_user(client, email=email, password=password)
+    token = _login(client, email, password)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    base = {"client_name": "A", "platform": "Workana", "project_title": "P", "amount": 100, "currency": "USD"}
+    ids = {}
+    for label, status_value in [("old_won", "Aceptada"), ("old_lost", "Rechazada"), ("old_open", "Enviada"), ("new_won", "Aceptada")]:
+        ids[label] = client.post("/proposals/", json={**base, "status": status_value}, headers=headers).json()["id"]
+
+    stats_before = client.get("/proposals/stats/basic", headers=headers).json()
+    revenue_before = client.get("/proposals/stats/revenue", headers=headers).json()
+
+    db = SessionLocal()
+    try:
+        old = datetime.now(timezone.utc) - timedelta(days=400)
+        db.query(models.Proposal).filter(
+            models.Proposal.id.in_([ids["old_won"], ids["old_lost"], ids["old_open"]])
+        ).update({models.Proposal.created_at: old}, synchronize_session=False)
+        db.commit()
+        assert archive.archive_closed_proposals(db, older_than_days=365, batch_size=1) == 2
+        assert archive.archive_closed_proposals(db, older_than_days=365) == 0
+        assert db.query(models.ArchivedProposal).count() == 2
+    finally:
+        db.close()
+
+    hot_ids = {row["id"] for row in client.get("/proposals/", headers=headers).json()}
+    assert hot_ids == {ids["old_open"], ids["new_won"]}
+    archived = client.get("/proposals/archive/", headers=headers).json()
+    assert {row["id"] for row in archived} == {ids["old_won"], ids["old_lost"]}
+    assert all(row["archived_at"] for row in archived)
+    assert client.get(f"/proposals/archive/{ids['old_won']}", headers=headers).json()["status"] == "Aceptada"
+    assert client.get(f"/proposals/{ids['old_won']}", headers=headers).status_code == 404
+
+    assert client.get("/proposals/stats/basic", headers=headers).json() == stats_before
+    assert client.get("/proposals/stats/revenue", headers=headers).json() == revenue_before
+    assert client.get("/dashboard/bootstrap", headers=headers).json()["stats"] == stats_before
+
+
+def test_archived_ids_are_not_reused_by_new_proposals(client: TestClient):
+    email = "reuse@example.com"
+    password = "Strong!Pass123"
+    _register_user(client, email=email, password=password)
+    token = _login(client, email, password)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    body = {"client_name": "A", "platform": "Workana", "project_title": "P", "amount": 10, "currency": "USD", "status": "Aceptada"}
+
+    def create_and_archive(count: int):
+        ids = [client.post("/proposals/", json=body, headers=headers).json()["id"] for _ in range(count)]
+        db = SessionLocal()
+        try:
+            old = datetime.now(timezone.utc) - timedelta(days=400)
+            db.query(models.Proposal).filter(models.Proposal.id.in_(ids[1:])).update(
+                {models.Proposal.created_at: old}, synchronize_session=False
+            )
+            db.commit()
+            assert archive.archive_closed_proposals(db, older_than_days=365) == count - 1
+        finally:
+            db.close()
+        return ids
+
+    first = create_and_archive(3)
+    second = create_and_archive(3)
+    assert min(second) > max(first)
+    archived = client.get("/proposals/archive/", headers=headers).json()
+    assert len(archived) == 4
+
+
+def test_event_rate_limit_filter_suppresses_repetitive_events():
+    limiter = logging_setup.EventRateLimitFilter(burst=3, window=60)
+
+    def record(event=None):
+        return logging.makeLogRecord({"msg": "x", "event": event} if event else {"msg": "x"})
+
+    passed = [limiter.filter(record("login_failed")) for _ in range(10)]
+    assert passed.count(True) == 3
+    assert limiter.filter(record()) is True
+    assert limiter.filter(record("login_success")) is True
+
+
+def test_queue_handler_never_blocks_and_emits_json_with_request_id():
+    handler = logging_setup.DroppingQueueHandler(queue.Queue(maxsize=1))
+    handler.addFilter(logging_setup.RequestIdFilter())
+    logging_setup.request_id_var.set("req-123")
+
+    for idx in range(3):
+        handler.handle(logging.makeLogRecord({"name": "t", "msg": "hola %s", "args": (idx,), "levelname": "INFO", "event": "e"}))
+    assert handler.dropped == 2
+
+    line = logging_setup.JsonFormatter().format(handler.queue.get_nowait())
+    payload = json.loads(line)
+    assert payload["message"] == "hola 0"
+    assert payload["request_id"] == "req-123"
+    assert payload["event"] == "e"
+
+
+def test_responses_carry_request_id(client: TestClient):
+    res = client.get("/auth/me", headers={"X-Request-ID": "abc"})
+    assert res.headers["X-Request-ID"] == "abc"
+    assert len(client.get("/auth/me").headers["X-Request-ID"]) == 32
+
+
+def test_profiles_tool_aggregates_saved_profiles_per_route(tmp_path):
+    for idx, wall in enumerate([10.0, 30.0, 20.0]):
+        metadata = {"method": "GET", "route": "/proposals/", "wall_ms": wall, "sql": {"count": 2, "ms": wall / 10, "statements": []}}
+        (tmp_path / f"p{idx}.json").write_text(json.dumps(metadata), encoding="utf-8")
+        (tmp_path / f"p{idx}.folded").write_text("main;list_proposals 3\nmain;get_current_user 1\n", encoding="utf-8")
+
+    grouped = profiles_tool.load_profiles(tmp_path)
+    [row] = profiles_tool.summarize(grouped)
+    assert row["profiles"] == 3
+    assert row["wall_ms_p50"] == 20.0
+    assert row["sql_ms_mean"] == 2.0
+
+    merged = profiles_tool.merge_stacks(grouped[("GET", "/proposals/")])
+    assert merged == {"main;list_proposals": 9, "main;get_current_user": 3}
+
+
+@pytest.fixture()
+def profiling_env(monkeypatch, tmp_path):
+    def configure(enabled: bool):
+        monkeypatch.setenv("FREELATRACKER_PROFILING_ENABLED", "true" if enabled else "false")
+        monkeypatch.setenv("FREELATRACKER_PROFILING_TOKEN", "profile-secret")
+        monkeypatch.setenv("FREELATRACKER_PROFILE_DIR", str(tmp_path))
+        for getter in (config.is_profiling_enabled, config.get_profiling_token, config.get_profile_dir):
+            getter.cache_clear()
+
+    yield configure
+    for name, listener in (
+        ("before_cursor_execute", profiling._before_cursor_execute),
+        ("after_cursor_execute", profiling._after_cursor_execute),
+    ):
+        if event.contains(Engine, name, listener):
+            event.remove(Engine, name, listener)
+    monkeypatch.undo()
+    for getter in (config.is_profiling_enabled, config.get_profiling_token, config.get_profile_dir):
+        getter.cache_clear()
+
+
+def _profiled_app() -> FastAPI:
+    profiled = FastAPI()
+
+    @profiled.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            value = conn.execute(text("SELECT :id"), {"id": item_id}).scalar()
+        time.sleep(0.05)
+        return {"id": value}
+
+    return profiled
+
+
+def test_profile_middleware_saves_profiles_only_for_the_admin_token(profiling_env, tmp_path):
+    profiling_env(enabled=False)
+    disabled = _profiled_app()
+    assert profiling.install(disabled) is False
+    assert disabled.user_middleware == []
+    assert not event.contains(Engine, "before_cursor_execute", profiling._before_cursor_execute)
+
+    profiling_env(enabled=True)
+    profiled = _profiled_app()
+    assert profiling.install(profiled) is True
+    with TestClient(profiled) as profiled_client:
+        for wrong_token in ("nope", "caf\xe9".encode("latin-1")):
+            wrong = profiled_client.get("/items/7", headers={"X-Profile-Token": wrong_token})
+            assert wrong.status_code == 200
+            assert "X-Profile-Id" not in wrong.headers
+        assert list(tmp_path.iterdir()) == []
+
+        # Concurrent work on other threads must not end up in this request's profile.
+        stop = threading.Event()
+
+        def busy_elsewhere():
+            while not stop.is_set():
+                sum(range(1000))
+
+        other = threading.Thread(target=busy_elsewhere)
+        other.start()
+        try:
+            res = profiled_client.get("/items/7", headers={"X-Profile-Token": "profile-secret"})
+        finally:
+            stop.set()
+            other.join()
+    assert res.json() == {"id": 7}
+    name = res.headers["X-Profile-Id"]
+    folded = (tmp_path / f"{name}.folded").read_text(encoding="utf-8")
+    assert "read_item" in folded
+    assert "busy_elsewhere" not in folded
+    metadata = json.loads((tmp_path / f"{name}.json").read_text(encoding="utf-8"))
+    assert metadata["route"] == "/items/{item_id}"
+    assert metadata["sql"]["count"] >= 1